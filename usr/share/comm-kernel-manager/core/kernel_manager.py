@@ -10,21 +10,94 @@ including listing, installing, and removing kernels.
 
 import os
 import re
+import json
 import subprocess
-import threading
 import logging
 import time
 import requests
-from xml.etree import ElementTree
-from core.package_manager import PackageManager
+from gi.repository import GLib
+from core.package_manager import (
+    CancelWatcher,
+    get_package_manager,
+    iter_output_batches,
+    submit_transaction,
+)
+
+# Progress parsing patterns for pacman output, compiled once
+_PERCENT_RE = re.compile(r"(\d+)%")
+_FRACTION_RE = re.compile(r"\((\d+)/(\d+)\)")
+_PACKAGE_RE = re.compile(r"(linux\w+)-(\d[\w\.\-]+)")
+
+# Every phrase the install/remove progress checks look for (lowercase), so a
+# single scan can tell whether a line needs to go through those checks
+_INSTALL_STEP_RE = re.compile("|".join(map(re.escape, (
+    "download", "baixando",
+    "installing", "instalando", "installed", "instalado",
+    "generating grub configuration file",
+    "gerando arquivo de configuração do grub",
+    "synchronizing package databases",
+    "sincronizando bases de dados de pacotes",
+    "checking dependencies", "verificando dependências",
+    "checking for file conflicts", "verificando conflitos de arquivos",
+    "total download size", "tamanho total de download",
+))))
+_REMOVE_STEP_RE = re.compile("|".join(map(re.escape, (
+    "checking dependencies", "verificando dependências",
+    "looking for conflicting packages", "procurando por pacotes conflitantes",
+    "removing", "removendo",
+    "running post-transaction hooks", "executando hooks pós-transação",
+    "generating grub configuration file",
+    "gerando arquivo de configuração do grub",
+    "error:", "image",
+))))
+
+# HTTP session reused for kernel.org requests (keeps the connection pooled)
+_HTTP_SESSION = requests.Session()
+
+# Digit runs, for natural ordering of kernel names and versions
+_DIGITS_RE = re.compile(r"(\d+)")
+
+
+def natural_key(text):
+    """
+    Build a sort key that orders embedded numbers numerically.
+
+    Args:
+        text: Kernel name or version string (e.g. "linux612", "6.12.8-1").
+
+    Returns:
+        tuple: Alternating text and integer parts, so "linux69" < "linux610".
+    """
+    parts = _DIGITS_RE.split(text)
+    parts[1::2] = map(int, parts[1::2])
+    return tuple(parts)
+
+
+# Kernel name patterns used to derive type flags
+_LINUX_NUM_RE = re.compile(r"^linux(\d+)$")
+_OPT_LEVEL_RE = re.compile(r"-x64v(\d)")
 
 
 class KernelManager:
     """Manager for handling Linux kernels."""
 
-    def __init__(self):
-        """Initialize the kernel manager."""
-        self.package_manager = PackageManager()
+    # How long a scan of the installed kernels is reused (seconds)
+    INSTALLED_CACHE_TTL = 5.0
+
+    # On-disk cache of the kernel.org LTS list and how long it stays fresh
+    LTS_CACHE_PATH = os.path.join(
+        GLib.get_user_cache_dir(), "kernel-manager", "lts-versions.json"
+    )
+    LTS_CACHE_TTL = 24 * 60 * 60
+
+    def __init__(self, package_manager=None):
+        """
+        Initialize the kernel manager.
+
+        Args:
+            package_manager: Shared PackageManager instance (optional).
+        """
+        self.package_manager = package_manager or get_package_manager()
 
         # Define true kernel patterns (not modules)
         self.kernel_patterns = [
@@ -58,41 +131,138 @@ class KernelManager:
             r"-rtl8723bu",
         ]
 
-        # Get LTS kernel versions from kernel.org
-        self.lts_versions = self._get_lts_kernel_versions()
+        # Fused into one compiled alternation each, so every installed and
+        # available package name is scanned once instead of once per pattern
+        # (the per-pattern ^/$ anchors are hoisted around the group)
+        self._kernel_re = re.compile(
+            "^(?:" + "|".join(p[1:-1] for p in self.kernel_patterns) + ")$"
+        )
+        self._excluded_re = re.compile("|".join(self.excluded_patterns))
+
+        # LTS kernel versions from kernel.org, fetched on first use so the
+        # network request runs in the background loader, not the UI thread
+        self._lts_versions = None
 
-    def _get_lts_kernel_versions(self):
+        # Type flags per kernel name, derived once per name
+        self._flag_cache = {}
+
+        # Last installed kernels scan and when it was taken (monotonic time)
+        self._installed_cache = None
+        self._installed_cache_ts = 0.0
+
+    @property
+    def lts_versions(self):
+        """list: LTS kernel versions (e.g. "612" for 6.12), fetched once."""
+        if self._lts_versions is None:
+            self._lts_versions = self._get_lts_kernel_versions()
+        return self._lts_versions
+
+    def _get_lts_kernel_versions(self, force_refresh=False):
         """
         Get a list of current LTS kernel versions from kernel.org.
 
+        A copy fetched within the last LTS_CACHE_TTL seconds is read from
+        disk instead of contacting kernel.org. An older copy is revalidated
+        with a conditional request, so an unchanged list costs one round
+        trip without a body.
+
+        Args:
+            force_refresh: Ignore the on-disk cache and fetch a fresh list.
+
         Returns:
             list: List of LTS kernel versions as strings (e.g. "612" for 6.12).
         """
+        cached = None
+        if not force_refresh:
+            cached = self._read_lts_cache(self.LTS_CACHE_TTL)
+            if cached is not None:
+                return cached["versions"]
+            cached = self._read_lts_cache(None)
+
         lts_versions = []
         try:
-            # Fetch kernel.org feed
-            response = requests.get("https://www.kernel.org/feeds/kdist.xml", timeout=5)
-            if response.status_code == 200:
-                # Parse XML
-                root = ElementTree.fromstring(response.content)
-                # Find all entries with "longterm" in title
-                for item in root.findall(".//item"):
-                    title = item.find("title")
-                    if title is not None and ": longterm" in title.text:
-                        # Extract version number
-                        version_match = re.match(r"(\d+\.\d+).*: longterm", title.text)
-                        if version_match:
-                            version = version_match.group(1)
-                            # Convert to format like "612" for 6.12
-                            numeric_version = version.replace(".", "")
-                            lts_versions.append(numeric_version)
+            headers = {}
+            if cached is not None:
+                if cached.get("etag"):
+                    headers["If-None-Match"] = cached["etag"]
+                if cached.get("last_modified"):
+                    headers["If-Modified-Since"] = cached["last_modified"]
+
+            # Fetch kernel.org release list (structured, no title parsing needed)
+            response = _HTTP_SESSION.get(
+                "https://www.kernel.org/releases.json", headers=headers, timeout=5
+            )
+            if response.status_code == 304 and cached is not None:
+                # Unchanged since the cached copy; restart its freshness period
+                os.utime(self.LTS_CACHE_PATH)
+                return cached["versions"]
 
+            if response.status_code == 200:
+                for release in response.json().get("releases", ()):
+                    if release.get("moniker") != "longterm":
+                        continue
+                    # Convert to format like "612" for 6.12.8
+                    major, minor = release["version"].split(".", 2)[:2]
+                    lts_versions.append(major + minor)
+
+            if lts_versions:
+                self._write_lts_cache({
+                    "versions": lts_versions,
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                })
             return lts_versions
         except Exception as e:
             logging.warning(f"Failed to get LTS kernel versions: {str(e)}")
+            # Prefer an outdated fetched list over the built-in one
+            if cached is None:
+                cached = self._read_lts_cache(None)
+            if cached is not None:
+                return cached["versions"]
             # Return a few known LTS versions as fallback
             return ["66", "612", "614"]
 
+    def _read_lts_cache(self, max_age):
+        """
+        Read the LTS version list saved by a previous fetch.
+
+        Args:
+            max_age: Maximum age in seconds, or None to accept any age.
+
+        Returns:
+            dict: Cached "versions" list with the response's "etag" and
+                "last_modified" validators, or None if missing, too old or
+                unreadable.
+        """
+        try:
+            if max_age is not None:
+                if time.time() - os.stat(self.LTS_CACHE_PATH).st_mtime > max_age:
+                    return None
+            with open(self.LTS_CACHE_PATH, "rb") as f:
+                entry = json.loads(f.read())
+            if isinstance(entry, dict) and isinstance(entry.get("versions"), list):
+                return entry
+        except (OSError, ValueError):
+            pass
+        return None
+
+    def _write_lts_cache(self, entry):
+        """
+        Save the LTS version list atomically for later runs.
+
+        Args:
+            entry: Dict with the "versions" list and the "etag" and
+                "last_modified" validators of the response.
+        """
+        tmp_path = self.LTS_CACHE_PATH + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.LTS_CACHE_PATH), exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(json.dumps(entry, separators=(",", ":")).encode())
+            os.replace(tmp_path, self.LTS_CACHE_PATH)
+        except OSError as e:
+            logging.warning(f"Failed to cache LTS kernel versions: {str(e)}")
+
     def get_installed_kernels(self):
         """
         Get a list of installed kernels.
@@ -100,6 +270,13 @@ class KernelManager:
         Returns:
             list: List of installed kernels with their information.
         """
+        # Reuse a recent scan; install and remove invalidate it
+        if (
+            self._installed_cache is not None
+            and time.monotonic() - self._installed_cache_ts < self.INSTALLED_CACHE_TTL
+        ):
+            return self._installed_cache
+
         installed_packages = self.package_manager.get_installed_packages()
 
         # Filter for kernel packages
@@ -117,8 +294,14 @@ class KernelManager:
 
                 kernels.append(kernel)
 
+        self._installed_cache = kernels
+        self._installed_cache_ts = time.monotonic()
         return kernels
 
+    def invalidate_installed_cache(self):
+        """Drop the cached installed kernels so the next query re-reads them."""
+        self._installed_cache = None
+
     def get_available_kernels(self):
         """
         Get a list of available kernels from repositories.
@@ -126,95 +309,71 @@ class KernelManager:
         Returns:
             list: List of available kernels with their information.
         """
-        # Get all available kernels
-        available_kernels = []
-
-        # Check each kernel pattern
-        for pattern in self.kernel_patterns:
-            # Get packages matching this pattern
-            packages = self._search_kernel_packages(pattern)
-            available_kernels.extend(packages)
+        # Get all available kernels with a single repository listing
+        available_kernels = self._list_repo_kernels()
 
         # Get installed kernels to mark them
-        installed_kernels = self.get_installed_kernels()
-        installed_names = [k["name"] for k in installed_kernels]
-
-        # Filter out duplicates and excluded patterns
-        filtered_kernels = []
-        seen_kernels = set()
+        installed_names = {k["name"] for k in self.get_installed_kernels()}
 
+        # The listing is already limited to real kernels, without duplicates
         for kernel in available_kernels:
-            kernel_name = kernel["name"]
-
-            # Skip if this is an excluded pattern (module package)
-            if any(
-                re.search(exclude, kernel_name) for exclude in self.excluded_patterns
-            ):
-                continue
-
-            # Skip if we've already seen this kernel with the same version
-            kernel_key = f"{kernel_name}-{kernel['version']}"
-            if kernel_key in seen_kernels:
-                continue
-
-            seen_kernels.add(kernel_key)
-
             # Mark installed kernels
-            kernel["installed"] = kernel_name in installed_names
+            kernel["installed"] = kernel["name"] in installed_names
 
             # Add kernel type flags
             self._add_kernel_flags(kernel)
 
-            filtered_kernels.append(kernel)
-
-        # Sort kernels by name and version
-        return sorted(filtered_kernels, key=lambda k: (k["name"], k["version"]))
+        # Sort kernels by name and version, comparing numbers numerically
+        return sorted(
+            available_kernels,
+            key=lambda k: (natural_key(k["name"]), natural_key(k["version"])),
+        )
 
-    def _search_kernel_packages(self, pattern):
+    def _list_repo_kernels(self):
         """
-        Search for kernel packages matching a pattern.
+        List the kernel packages available in the sync repositories.
 
-        Args:
-            pattern: Regex pattern to search for.
+        Uses one "pacman -Sl" call, which prints one "repo name version"
+        line per package, instead of a "pacman -Ss" search per pattern.
 
         Returns:
-            list: List of matching packages.
+            list: Kernel packages found in the repositories, one entry per
+                name and version (the first repository listing it wins).
         """
-        # Use pacman to search for packages
-        cmd = ["pacman", "-Ss", f"^{pattern}"]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=False)
+        cmd = ["pacman", "-Sl"]
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            check=False,
+            env=self.package_manager.command_env,
+        )
 
         if result.returncode != 0:
             return []
 
-        packages = []
-        current_package = None
-
-        for line in result.stdout.strip().split("\n"):
-            if not line:
-                continue
+        # Keyed by (name, version) so duplicates across repositories collapse
+        packages = {}
+        is_kernel_package = self._is_kernel_package
 
-            # New package entry starts with repo/name version
-            if line.startswith(" "):
-                # This is a description line, skip
+        for line in result.stdout.splitlines():
+            # Lines are "repo name version" with an optional "[installed]" tail
+            fields = line.split(None, 3)
+            if len(fields) < 3:
                 continue
 
-            # Parse package information
-            match = re.match(r"([^\s]+)/([^\s]+)\s+([^\s]+)", line)
-            if match:
-                repo = match.group(1)
-                package_name = match.group(2)
-                package_version = match.group(3)
+            repo, package_name, package_version = fields[:3]
 
-                # Only include if it's actually a kernel package
-                if self._is_kernel_package(package_name):
-                    packages.append({
-                        "name": package_name,
-                        "version": package_version,
-                        "repository": repo,
-                    })
+            # Only include if it's actually a kernel package
+            key = (package_name, package_version)
+            if key not in packages and is_kernel_package(package_name):
+                packages[key] = {
+                    "name": package_name,
+                    "version": package_version,
+                    "repository": repo,
+                }
 
-        return packages
+        return list(packages.values())
 
     def _is_kernel_package(self, package_name):
         """
@@ -226,18 +385,12 @@ class KernelManager:
         Returns:
             bool: True if it's a kernel package, False otherwise.
         """
-        # Check if it matches any kernel pattern
-        is_kernel = any(
-            re.match(pattern, package_name) for pattern in self.kernel_patterns
+        # Must match a kernel pattern and must not be an excluded pattern
+        return (
+            self._kernel_re.match(package_name) is not None
+            and self._excluded_re.search(package_name) is None
         )
 
-        # Ensure it's not an excluded pattern
-        is_excluded = any(
-            re.search(exclude, package_name) for exclude in self.excluded_patterns
-        )
-
-        return is_kernel and not is_excluded
-
     def _add_kernel_flags(self, kernel):
         """
         Add flags to identify kernel types (RT, LTS, etc.)
@@ -250,33 +403,57 @@ class KernelManager:
         """
         kernel_name = kernel["name"]
 
-        # Add RT flag
-        if "-rt" in kernel_name:
-            kernel["rt"] = True
+        flags = self._flag_cache.get(kernel_name)
+        if flags is None:
+            flags = self._flag_cache[kernel_name] = self._compute_kernel_flags(
+                kernel_name
+            )
+        kernel.update(flags)
+
+    def _compute_kernel_flags(self, kernel_name):
+        """
+        Derive the type flags for a kernel name.
+
+        Args:
+            kernel_name: Name of the kernel package.
+
+        Returns:
+            dict: The rt, lts, xanmod and optimized flags, plus opt_level
+                for optimized builds.
+        """
+        # Flags are always present so consumers can read them directly
+        flags = {
+            "rt": "-rt" in kernel_name,
+            "lts": False,
+            "xanmod": False,
+            "optimized": False,
+        }
 
         # Add LTS flag for explicitly named LTS kernels
         if "-lts" in kernel_name:
-            kernel["lts"] = True
+            flags["lts"] = True
 
         # Check for Manjaro kernels that match LTS versions
-        elif not "xanmod" in kernel_name and re.match(r"^linux\d+$", kernel_name):
+        elif not "xanmod" in kernel_name:
             # Extract the version number from the kernel name
-            version_match = re.match(r"^linux(\d+)$", kernel_name)
+            version_match = _LINUX_NUM_RE.match(kernel_name)
             if version_match:
                 kernel_version = version_match.group(1)
                 # Check if this version is in our LTS list
                 if kernel_version in self.lts_versions:
-                    kernel["lts"] = True
+                    flags["lts"] = True
 
         # Add XanMod flag
         if "xanmod" in kernel_name:
-            kernel["xanmod"] = True
+            flags["xanmod"] = True
 
         # Add optimized build flags (x64v3, x64v4)
-        match = re.search(r"-x64v(\d)", kernel_name)
+        match = _OPT_LEVEL_RE.search(kernel_name)
         if match:
-            kernel["optimized"] = True
-            kernel["opt_level"] = match.group(1)
+            flags["optimized"] = True
+            flags["opt_level"] = match.group(1)
+
+        return flags
 
     def _get_kernel_modules(self, kernel_name):
         """
@@ -301,6 +478,7 @@ class KernelManager:
         progress_callback=None,
         output_callback=None,
         complete_callback=None,
+        cancel_event=None,
     ):
         """
         Install a kernel and its associated modules.
@@ -310,6 +488,11 @@ class KernelManager:
             progress_callback: Callback function for progress updates.
             output_callback: Callback function for command output.
             complete_callback: Callback function for completion notification.
+            cancel_event: Optional threading.Event; setting it stops pacman
+                if its transaction has not started yet.
+
+        Returns:
+            concurrent.futures.Future: Completes when the transaction has ended.
         """
         # Get the kernel name and its associated modules
         kernel_name = kernel["name"]
@@ -318,15 +501,23 @@ class KernelManager:
         # All packages to install
         packages = [kernel_name] + modules
 
-        # Start a thread for installation
-        threading.Thread(
-            target=self._install_kernel_thread,
-            args=(packages, progress_callback, output_callback, complete_callback),
-            daemon=True,
-        ).start()
+        # Run installation on the shared transaction worker
+        return submit_transaction(
+            self._install_kernel_thread,
+            packages,
+            progress_callback,
+            output_callback,
+            complete_callback,
+            cancel_event,
+        )
 
     def _install_kernel_thread(
-        self, packages, progress_callback, output_callback, complete_callback
+        self,
+        packages,
+        progress_callback,
+        output_callback,
+        complete_callback,
+        cancel_event=None,
     ):
         """
         Thread function for kernel installation.
@@ -336,6 +527,8 @@ class KernelManager:
             progress_callback: Callback function for progress updates.
             output_callback: Callback function for command output.
             complete_callback: Callback function for completion notification.
+            cancel_event: Optional threading.Event; setting it stops pacman
+                if its transaction has not started yet.
         """
         if output_callback:
             output_callback(f"Thread started for kernel installation...")
@@ -361,19 +554,12 @@ class KernelManager:
             if output_callback:
                 output_callback("Creating subprocess...")
 
-            # Create environment with LANG set to ensure consistent output formatting
-            my_env = os.environ.copy()
-            my_env["LANG"] = "C"  # Use standard C locale for consistent output
-
             process = subprocess.Popen(
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
                 stdin=subprocess.DEVNULL,  # IMPORTANTE: Fornece stdin vazio para evitar bloqueio
-                text=True,
-                bufsize=1,  # Line buffered
-                universal_newlines=True,  # Ensure text mode with universal newlines
-                env=my_env,  # Use our custom environment
+                env=self.package_manager.command_env,  # C locale for consistent output
             )
 
             if output_callback:
@@ -386,128 +572,139 @@ class KernelManager:
             last_progress_update = time.time()
             last_line_time = time.time()
 
-            # Process output line by line
-            for line in iter(process.stdout.readline, ""):
-                line = line.strip()
+            # Process output in batches, with one output callback per batch
+            # Cancel requests are honoured until pacman starts its transaction
+            watcher = CancelWatcher(process, cancel_event)
+
+            for lines in iter_output_batches(process.stdout, idle_timeout=0.5):
+                status = watcher.poll(lines)
+                if status == CancelWatcher.STOPPED:
+                    if output_callback:
+                        output_callback("Cancelled, pacman was stopped.")
+                    break
+                if status == CancelWatcher.REFUSED and output_callback:
+                    output_callback(
+                        "Cannot cancel: pacman has started the transaction, "
+                        "waiting for it to finish..."
+                    )
+
+                lines = [line.strip() for line in lines]
                 # Send output to callback
-                if output_callback and line:
-                    output_callback(line)
+                batch_text = "\n".join(line for line in lines if line)
+                if output_callback and batch_text:
+                    output_callback(batch_text)
                     last_line_time = time.time()
 
-                # Parse progress information - be more aggressive in parsing for better feedback
-                if (
-                    "downloading" in line.lower()
-                    or "baixando" in line.lower()
-                    or "download" in line.lower()
-                ):
-                    downloading = True
-
-                    # Try to extract percentage directly
-                    percent_match = re.search(r"(\d+)%", line)
-                    if percent_match:
-                        percent = float(percent_match.group(1))
-                        # Scale percentage to our progress range (10%-50%)
-                        progress = 0.1 + (percent / 100.0) * 0.4
-                        if progress_callback:
-                            progress_callback(progress, f"Downloading: {percent:.1f}%")
+                for line in lines:
+                    line_lc = line.lower()
+                    # Most lines carry no progress keyword; skip the checks for them
+                    if _INSTALL_STEP_RE.search(line_lc):
+                        # Parse progress information - be more aggressive in parsing for better feedback
+                        # ("download" also covers "downloading")
+                        if "download" in line_lc or "baixando" in line_lc:
+                            downloading = True
+
+                            # Try to extract percentage directly
+                            percent_match = _PERCENT_RE.search(line)
+                            if percent_match:
+                                percent = float(percent_match.group(1))
+                                # Scale percentage to our progress range (10%-50%)
+                                progress = 0.1 + (percent / 100.0) * 0.4
+                                if progress_callback:
+                                    progress_callback(progress, f"Downloading: {percent:.1f}%")
+
+                            # Alternative approach for download progress
+                            match = _FRACTION_RE.search(line)
+                            if match:
+                                current = int(match.group(1))
+                                total = int(match.group(2))
+                                progress = (
+                                    0.1 + (current / total) * 0.4
+                                )  # 10%-50% for downloading
+
+                                if progress_callback:
+                                    progress_callback(
+                                        progress, f"Downloading packages ({current}/{total})..."
+                                    )
+
+                            # Provide some feedback even if we can't extract precise progress
+                            else:
+                                # Only update if we haven't recently
+                                current_time = time.time()
+                                if current_time - last_progress_update > 1.0:
+                                    if progress_callback:
+                                        progress_callback(progress, "Downloading packages...")
+                                    last_progress_update = current_time
+
+                        elif "installing" in line_lc or "instalando" in line_lc:
+                            installing = True
+                            if progress_callback:
+                                progress_callback(0.5, "Installing kernel...")
 
-                    # Alternative approach for download progress
-                    match = re.search(r"\((\d+)/(\d+)\)", line)
-                    if match:
-                        current = int(match.group(1))
-                        total = int(match.group(2))
-                        progress = (
-                            0.1 + (current / total) * 0.4
-                        )  # 10%-50% for downloading
+                        elif installing and (
+                            "installed" in line_lc or "instalado" in line_lc
+                        ):
+                            # Rough estimation of installation progress
+                            progress = min(0.5 + progress * 0.1, 0.9)  # 50%-90% for installing
+                            if progress_callback:
+                                progress_callback(progress, "Installing...")
 
-                        if progress_callback:
-                            progress_callback(
-                                progress, f"Downloading packages ({current}/{total})..."
-                            )
+                        elif (
+                            "generating grub configuration file" in line_lc
+                            or "gerando arquivo de configuração do grub" in line_lc
+                        ):
+                            if progress_callback:
+                                progress_callback(0.9, "Updating bootloader...")
 
-                    # Provide some feedback even if we can't extract precise progress
-                    else:
-                        # Only update if we haven't recently
-                        current_time = time.time()
-                        if current_time - last_progress_update > 1.0:
+                        # Additional progress indicators
+                        elif (
+                            "synchronizing package databases" in line_lc
+                            or "sincronizando bases de dados de pacotes" in line_lc
+                        ):
                             if progress_callback:
-                                progress_callback(progress, "Downloading packages...")
-                            last_progress_update = current_time
-
-                elif "installing" in line.lower() or "instalando" in line.lower():
-                    installing = True
-                    if progress_callback:
-                        progress_callback(0.5, "Installing kernel...")
-
-                elif installing and (
-                    "installed" in line.lower() or "instalado" in line.lower()
-                ):
-                    # Rough estimation of installation progress
-                    progress = min(0.5 + progress * 0.1, 0.9)  # 50%-90% for installing
-                    if progress_callback:
-                        progress_callback(progress, "Installing...")
-
-                elif (
-                    "generating grub configuration file" in line.lower()
-                    or "gerando arquivo de configuração do grub" in line.lower()
-                ):
-                    if progress_callback:
-                        progress_callback(0.9, "Updating bootloader...")
-
-                # Additional progress indicators
-                elif (
-                    "synchronizing package databases" in line.lower()
-                    or "sincronizando bases de dados de pacotes" in line.lower()
-                ):
-                    if progress_callback:
-                        progress_callback(0.1, "Synchronizing package databases...")
-
-                elif (
-                    "checking dependencies" in line.lower()
-                    or "verificando dependências" in line.lower()
-                ):
-                    if progress_callback:
-                        progress_callback(0.2, "Checking dependencies...")
-
-                elif (
-                    "checking for file conflicts" in line.lower()
-                    or "verificando conflitos de arquivos" in line.lower()
-                ):
-                    if progress_callback:
-                        progress_callback(0.4, "Checking for file conflicts...")
-
-                # Package sizes and totals
-                elif (
-                    "total download size" in line.lower()
-                    or "tamanho total de download" in line.lower()
-                ):
-                    if output_callback:
-                        output_callback("➡️ " + line)
-
-                # Extract package name/version for better progress indication
-                pkg_match = re.search(r"(linux\w+)-(\d[\w\.\-]+)", line)
-                if pkg_match and installing:
-                    pkg_name = pkg_match.group(1)
-                    pkg_version = pkg_match.group(2)
-                    if progress_callback:
-                        progress_callback(
-                            progress, f"Installing {pkg_name} {pkg_version}"
-                        )
+                                progress_callback(0.1, "Synchronizing package databases...")
 
-                # Handle common issues
-                elif "error:" in line.lower():
-                    if output_callback:
-                        output_callback(f"❌ ERROR: {line}")
+                        elif (
+                            "checking dependencies" in line_lc
+                            or "verificando dependências" in line_lc
+                        ):
+                            if progress_callback:
+                                progress_callback(0.2, "Checking dependencies...")
 
-                # Send periodic updates even without new information
-                current_time = time.time()
-                if current_time - last_progress_update > 0.5:  # Every half second
-                    if progress_callback:
-                        # Send the same progress to keep UI responsive
-                        progress_callback(progress, None)
-                    last_progress_update = current_time
+                        elif (
+                            "checking for file conflicts" in line_lc
+                            or "verificando conflitos de arquivos" in line_lc
+                        ):
+                            if progress_callback:
+                                progress_callback(0.4, "Checking for file conflicts...")
+
+                        # Package sizes and totals
+                        elif (
+                            "total download size" in line_lc
+                            or "tamanho total de download" in line_lc
+                        ):
+                            if output_callback:
+                                output_callback("➡️ " + line)
+
+                    # Extract package name/version for better progress indication
+                    # (only used while installing, so skip the scan otherwise)
+                    pkg_match = _PACKAGE_RE.search(line) if installing else None
+                    if pkg_match:
+                        pkg_name = pkg_match.group(1)
+                        pkg_version = pkg_match.group(2)
+                        if progress_callback:
+                            progress_callback(
+                                progress, f"Installing {pkg_name} {pkg_version}"
+                            )
+
+                    # Handle common issues
+                    elif "error:" in line_lc:
+                        if output_callback:
+                            output_callback(f"❌ ERROR: {line}")
 
                 # If no output for more than 5 seconds, send a status message
+                # (the progress dialog keeps showing the last progress by itself)
+                current_time = time.time()
                 if current_time - last_line_time > 5:
                     if output_callback:
                         output_callback(
@@ -515,14 +712,12 @@ class KernelManager:
                         )
                     last_line_time = current_time
 
-                # Small pause to avoid CPU overload
-                time.sleep(0.01)
-
             if output_callback:
                 output_callback("Process completed, checking exit code...")
 
             # Wait for process to complete
             process.wait()
+            self.invalidate_installed_cache()
 
             # Check if installation was successful
             success = process.returncode == 0
@@ -558,6 +753,9 @@ class KernelManager:
             if output_callback:
                 output_callback(f"❌ {error_msg}")
 
+            # The package set may have changed before the failure
+            self.invalidate_installed_cache()
+
             if complete_callback:
                 complete_callback(False)
 
@@ -567,6 +765,7 @@ class KernelManager:
         progress_callback=None,
         output_callback=None,
         complete_callback=None,
+        cancel_event=None,
     ):
         """
         Remove a kernel and its modules.
@@ -576,6 +775,11 @@ class KernelManager:
             progress_callback: Callback function for progress updates.
             output_callback: Callback function for command output.
             complete_callback: Callback function for completion notification.
+            cancel_event: Optional threading.Event; setting it stops pacman
+                if its transaction has not started yet.
+
+        Returns:
+            concurrent.futures.Future: Completes when the transaction has ended.
         """
         # Get the kernel name and its associated modules
         kernel_name = kernel["name"]
@@ -584,26 +788,26 @@ class KernelManager:
         # All packages to remove
         packages = [kernel_name] + modules
 
-        # Filter for installed packages only
-        installed_packages = []
-        for pkg in packages:
-            if self.package_manager.is_package_installed(pkg):
-                installed_packages.append(pkg)
-
-        # Start a thread for removal
-        threading.Thread(
-            target=self._remove_kernel_thread,
-            args=(
-                installed_packages,
-                progress_callback,
-                output_callback,
-                complete_callback,
-            ),
-            daemon=True,
-        ).start()
+        # Filter for installed packages only (one pacman call for all of them)
+        installed_packages = self.package_manager.filter_installed(packages)
+
+        # Run removal on the shared transaction worker
+        return submit_transaction(
+            self._remove_kernel_thread,
+            installed_packages,
+            progress_callback,
+            output_callback,
+            complete_callback,
+            cancel_event,
+        )
 
     def _remove_kernel_thread(
-        self, packages, progress_callback, output_callback, complete_callback
+        self,
+        packages,
+        progress_callback,
+        output_callback,
+        complete_callback,
+        cancel_event=None,
     ):
         """
         Thread function for kernel removal.
@@ -613,6 +817,8 @@ class KernelManager:
             progress_callback: Callback function for progress updates.
             output_callback: Callback function for command output.
             complete_callback: Callback function for completion notification.
+            cancel_event: Optional threading.Event; setting it stops pacman
+                if its transaction has not started yet.
         """
         if not packages:
             if output_callback:
@@ -647,9 +853,8 @@ class KernelManager:
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,  # Line buffered
-                universal_newlines=True,  # Ensure text mode with universal newlines
+                stdin=subprocess.DEVNULL,
+                env=self.package_manager.command_env,
             )
 
             if output_callback:
@@ -657,98 +862,110 @@ class KernelManager:
 
             # Initialize tracking variables
             progress = 0.1
-            last_progress_update = time.time()
             last_line_time = time.time()
             removal_step = 0
             total_packages = len(packages)
             packages_processed = 0
 
-            # Process output line by line
-            for line in iter(process.stdout.readline, ""):
-                line = line.strip()
+            # Process output in batches, with one output callback per batch
+            # Cancel requests are honoured until pacman starts its transaction
+            watcher = CancelWatcher(process, cancel_event)
+
+            for lines in iter_output_batches(process.stdout, idle_timeout=0.5):
+                status = watcher.poll(lines)
+                if status == CancelWatcher.STOPPED:
+                    if output_callback:
+                        output_callback("Cancelled, pacman was stopped.")
+                    break
+                if status == CancelWatcher.REFUSED and output_callback:
+                    output_callback(
+                        "Cannot cancel: pacman has started the transaction, "
+                        "waiting for it to finish..."
+                    )
+
+                lines = [line.strip() for line in lines]
                 # Send output to callback
-                if output_callback and line:
-                    output_callback(line)
+                batch_text = "\n".join(line for line in lines if line)
+                if output_callback and batch_text:
+                    output_callback(batch_text)
                     last_line_time = time.time()
 
-                # Parse progress information based on common messages in pacman output
-                if (
-                    "checking dependencies" in line.lower()
-                    or "verificando dependências" in line.lower()
-                ):
-                    progress = 0.2
-                    removal_step = 1
-                    if progress_callback:
-                        progress_callback(progress, "Checking dependencies...")
-
-                elif (
-                    "looking for conflicting packages" in line.lower()
-                    or "procurando por pacotes conflitantes" in line.lower()
-                ):
-                    progress = 0.3
-                    removal_step = 2
-                    if progress_callback:
-                        progress_callback(
-                            progress, "Looking for conflicting packages..."
-                        )
-
-                elif "removing" in line.lower() or "removendo" in line.lower():
-                    packages_processed += 1
-                    # Calculate progress based on packages processed
-                    if total_packages > 0:
-                        progress = 0.3 + (packages_processed / total_packages) * 0.4
-                    else:
-                        progress = (
-                            0.5  # Default progress if we can't calculate accurately
-                        )
-                    removal_step = 3
-                    if progress_callback:
-                        progress_callback(
-                            progress,
-                            f"Removing packages ({packages_processed}/{total_packages})...",
-                        )
+                for line in lines:
+                    line_lc = line.lower()
+                    # Most lines carry no progress keyword; skip the checks for them
+                    if _REMOVE_STEP_RE.search(line_lc):
+                        # Parse progress information based on common messages in pacman output
+                        if (
+                            "checking dependencies" in line_lc
+                            or "verificando dependências" in line_lc
+                        ):
+                            progress = 0.2
+                            removal_step = 1
+                            if progress_callback:
+                                progress_callback(progress, "Checking dependencies...")
+
+                        elif (
+                            "looking for conflicting packages" in line_lc
+                            or "procurando por pacotes conflitantes" in line_lc
+                        ):
+                            progress = 0.3
+                            removal_step = 2
+                            if progress_callback:
+                                progress_callback(
+                                    progress, "Looking for conflicting packages..."
+                                )
+
+                        elif "removing" in line_lc or "removendo" in line_lc:
+                            packages_processed += 1
+                            # Calculate progress based on packages processed
+                            if total_packages > 0:
+                                progress = 0.3 + (packages_processed / total_packages) * 0.4
+                            else:
+                                progress = (
+                                    0.5  # Default progress if we can't calculate accurately
+                                )
+                            removal_step = 3
+                            if progress_callback:
+                                progress_callback(
+                                    progress,
+                                    f"Removing packages ({packages_processed}/{total_packages})...",
+                                )
+
+                        elif (
+                            "running post-transaction hooks" in line_lc
+                            or "executando hooks pós-transação" in line_lc
+                        ):
+                            progress = 0.8
+                            removal_step = 4
+                            if progress_callback:
+                                progress_callback(progress, "Running post-transaction hooks...")
+
+                        elif (
+                            "generating grub configuration file" in line_lc
+                            or "gerando arquivo de configuração do grub" in line_lc
+                        ):
+                            progress = 0.9
+                            removal_step = 5
+                            if progress_callback:
+                                progress_callback(0.9, "Updating bootloader...")
 
-                elif (
-                    "running post-transaction hooks" in line.lower()
-                    or "executando hooks pós-transação" in line.lower()
-                ):
-                    progress = 0.8
-                    removal_step = 4
-                    if progress_callback:
-                        progress_callback(progress, "Running post-transaction hooks...")
-
-                elif (
-                    "generating grub configuration file" in line.lower()
-                    or "gerando arquivo de configuração do grub" in line.lower()
-                ):
-                    progress = 0.9
-                    removal_step = 5
-                    if progress_callback:
-                        progress_callback(0.9, "Updating bootloader...")
-
-                # Handle common issues
-                elif "error:" in line.lower():
-                    if output_callback:
-                        output_callback(f"ERROR: {line}")
-
-                # Calculate progress based on line content if not specifically detected
-                elif "image" in line.lower() and "found" in line.lower():
-                    # This is during bootloader update process
-                    progress = 0.85
-                    if progress_callback:
-                        progress_callback(
-                            progress, "Updating bootloader information..."
-                        )
+                        # Handle common issues
+                        elif "error:" in line_lc:
+                            if output_callback:
+                                output_callback(f"ERROR: {line}")
 
-                # Send periodic updates even without new information
-                current_time = time.time()
-                if current_time - last_progress_update > 0.5:  # Every half second
-                    if progress_callback:
-                        # Send the same progress to keep UI responsive
-                        progress_callback(progress, None)
-                    last_progress_update = current_time
+                        # Calculate progress based on line content if not specifically detected
+                        elif "image" in line_lc and "found" in line_lc:
+                            # This is during bootloader update process
+                            progress = 0.85
+                            if progress_callback:
+                                progress_callback(
+                                    progress, "Updating bootloader information..."
+                                )
 
                 # If no output for more than 5 seconds, send a status message
+                # (the progress dialog keeps showing the last progress by itself)
+                current_time = time.time()
                 if current_time - last_line_time > 5:
                     if output_callback:
                         output_callback(
@@ -756,14 +973,12 @@ class KernelManager:
                         )
                     last_line_time = current_time
 
-                # Small pause to avoid CPU overload
-                time.sleep(0.01)
-
             if output_callback:
                 output_callback("Process completed, checking exit code...")
 
             # Wait for process to complete
             process.wait()
+            self.invalidate_installed_cache()
 
             # Check if removal was successful
             success = process.returncode == 0
@@ -799,5 +1014,8 @@ class KernelManager:
             if output_callback:
                 output_callback(error_msg)
 
+            # The package set may have changed before the failure
+            self.invalidate_installed_cache()
+
             if complete_callback:
                 complete_callback(False)
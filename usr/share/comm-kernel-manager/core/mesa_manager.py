@@ -11,53 +11,80 @@ including listing, installing, and switching between different versions.
 import os
 import re
 import subprocess
-import threading
 import time
-from core.package_manager import PackageManager
+from types import MappingProxyType
+from core.package_manager import (
+    get_package_manager,
+    iter_output_lines,
+    submit_transaction,
+)
+
+# Matches pacman's "(current/total)" download counter
+_PROGRESS_RE = re.compile(r"\((\d+)/(\d+)\)")
+
+# pkexec exit codes for a dismissed or failed authentication; pacman never
+# ran, so there is nothing to fall back from
+_PKEXEC_ABORT_CODES = frozenset((126, 127))
+
+# Available Mesa driver options (read-only)
+_DRIVERS = (
+    MappingProxyType({
+        "id": "amber",
+        "name": "Amber",
+        "packages": ("mesa-amber",),
+        "conflicts": ("mesa", "mesa-git", "mesa-tkg-git"),
+        "description": "Stable and well-tested version of Mesa"
+    }),
+    MappingProxyType({
+        "id": "stable",
+        "name": "Stable",
+        "packages": ("mesa",),
+        "conflicts": ("mesa-amber", "mesa-git", "mesa-tkg-git"),
+        "description": "Regular Mesa release"
+    }),
+    MappingProxyType({
+        "id": "tkg-stable",
+        "name": "Tkg-Stable",
+        "packages": ("mesa-tkg",),
+        "conflicts": ("mesa", "mesa-amber", "mesa-git", "mesa-tkg-git"),
+        "description": "Enhanced performance build of stable Mesa"
+    }),
+    MappingProxyType({
+        "id": "tkg-git",
+        "name": "Tkg-git",
+        "packages": ("mesa-tkg-git",),
+        "conflicts": ("mesa", "mesa-amber", "mesa-tkg"),
+        "description": "Latest development version with cutting-edge features"
+    }),
+)
+
+# Lookup tables: driver ID -> driver, package name -> driver ID
+_DRIVERS_BY_ID = {driver["id"]: driver for driver in _DRIVERS}
+_PKG_TO_DRIVER_ID = {
+    package: driver["id"]
+    for driver in _DRIVERS
+    for package in driver["packages"]
+}
+_MESA_PACKAGES = frozenset(_PKG_TO_DRIVER_ID)
 
 
 class MesaManager:
     """Manager for handling Mesa drivers."""
 
-    def __init__(self):
-        """Initialize the Mesa manager."""
-        self.package_manager = PackageManager()
+    def __init__(self, package_manager=None):
+        """
+        Initialize the Mesa manager.
+
+        Args:
+            package_manager: Shared PackageManager instance (optional).
+        """
+        self.package_manager = package_manager or get_package_manager()
         
-        # Define available Mesa drivers
-        self._define_available_drivers()
-    
-    def _define_available_drivers(self):
-        """Define available Mesa driver options."""
-        self.drivers = [
-            {
-                "id": "amber",
-                "name": "Amber",
-                "packages": ["mesa-amber"],
-                "conflicts": ["mesa", "mesa-git", "mesa-tkg-git"],
-                "description": "Stable and well-tested version of Mesa"
-            },
-            {
-                "id": "stable",
-                "name": "Stable",
-                "packages": ["mesa"],
-                "conflicts": ["mesa-amber", "mesa-git", "mesa-tkg-git"],
-                "description": "Regular Mesa release"
-            },
-            {
-                "id": "tkg-stable",
-                "name": "Tkg-Stable",
-                "packages": ["mesa-tkg"],
-                "conflicts": ["mesa", "mesa-amber", "mesa-git", "mesa-tkg-git"],
-                "description": "Enhanced performance build of stable Mesa"
-            },
-            {
-                "id": "tkg-git",
-                "name": "Tkg-git",
-                "packages": ["mesa-tkg-git"],
-                "conflicts": ["mesa", "mesa-amber", "mesa-tkg"],
-                "description": "Latest development version with cutting-edge features"
-            }
-        ]
+        # Available Mesa drivers and their lookup tables (shared constants)
+        self.drivers = _DRIVERS
+        self._by_id = _DRIVERS_BY_ID
+        self._pkg_to_driver_id = _PKG_TO_DRIVER_ID
+        self._mesa_packages = _MESA_PACKAGES
     
     def get_available_drivers(self):
         """
@@ -69,12 +96,12 @@ class MesaManager:
         # Determine which driver is currently active
         active_driver = self._get_active_driver()
         
-        # Mark the active driver
-        drivers = self.drivers.copy()
-        for driver in drivers:
-            driver["active"] = (driver["id"] == active_driver)
-        
-        return drivers
+        # Mark the active driver on per-call copies so the canonical
+        # definitions are never mutated
+        return [
+            dict(driver, active=(driver["id"] == active_driver))
+            for driver in self.drivers
+        ]
     
     def _get_active_driver(self):
         """
@@ -83,16 +110,16 @@ class MesaManager:
         Returns:
             str: ID of the active driver, or None if not determined.
         """
-        # Get installed Mesa packages
-        installed_packages = self.package_manager.get_installed_packages()
-        installed_names = [pkg["name"] for pkg in installed_packages]
+        # Get installed package names
+        installed_names = self.package_manager.get_installed_package_names()
         
-        # Check each driver
-        for driver in self.drivers:
-            # If any of the driver's packages are installed, consider it active
-            for package in driver["packages"]:
-                if package in installed_names:
-                    return driver["id"]
+        # Narrow down to installed Mesa packages with a single set intersection
+        installed_mesa = self._mesa_packages.intersection(installed_names)
+        if installed_mesa:
+            # The first driver (in definition order) with an installed package is active
+            for package, driver_id in self._pkg_to_driver_id.items():
+                if package in installed_mesa:
+                    return driver_id
         
         # Default to stable if no specific driver is detected
         return "stable"
@@ -107,27 +134,28 @@ class MesaManager:
             complete_callback: Callback function for completion notification.
         """
         # Find the driver by ID
-        selected_driver = None
-        for driver in self.drivers:
-            if driver["id"] == driver_id:
-                selected_driver = driver
-                break
+        selected_driver = self._by_id.get(driver_id)
         
         if not selected_driver:
             if complete_callback:
                 complete_callback(False)
             return
         
-        # Start a thread for applying the driver
-        threading.Thread(
-            target=self._apply_driver_thread,
-            args=(selected_driver, progress_callback, complete_callback),
-            daemon=True
-        ).start()
+        # Queue the change on the shared transaction worker
+        submit_transaction(
+            self._apply_driver_thread,
+            selected_driver,
+            progress_callback,
+            complete_callback
+        )
     
     def _apply_driver_thread(self, driver, progress_callback, complete_callback):
         """
         Thread function for applying a driver.
+
+        The driver packages are first installed in a single pacman transaction
+        that replaces conflicting packages. If that fails, the conflicts are
+        removed explicitly and the installation is retried.
         
         Args:
             driver: The driver configuration to apply.
@@ -138,114 +166,32 @@ class MesaManager:
             progress_callback(0.1, f"Applying {driver['name']} driver...")
         
         try:
-            # 1. First, remove conflicting packages
-            if driver["conflicts"]:
-                if progress_callback:
-                    progress_callback(0.2, "Removing conflicting packages...")
-                
-                # Build remove command
-                remove_cmd = [
-                    self.package_manager.sudo_command,
-                    "pacman",
-                    "-Rs",
-                    "--noconfirm"
-                ]
-                
-                # Add conflicts to remove
-                installed_conflicts = []
-                for conflict in driver["conflicts"]:
-                    if self.package_manager.is_package_installed(conflict):
-                        installed_conflicts.append(conflict)
-                
-                # If there are conflicts to remove
-                if installed_conflicts:
-                    remove_cmd.extend(installed_conflicts)
-                    
-                    # Execute remove command
-                    remove_process = subprocess.Popen(
-                        remove_cmd,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.STDOUT,
-                        text=True,
-                        bufsize=1
-                    )
-                    
-                    # Process output
-                    for line in iter(remove_process.stdout.readline, ""):
-                        if "removing" in line.lower():
-                            if progress_callback:
-                                progress_callback(0.3, "Removing conflicting packages...")
-                    
-                    # Wait for completion
-                    remove_process.wait()
-                    
-                    # Check if successful
-                    if remove_process.returncode != 0:
-                        if progress_callback:
-                            progress_callback(0.0, "Failed to remove conflicting packages.")
-                        
-                        if complete_callback:
-                            complete_callback(False)
-                        return
-            
-            # 2. Install the new packages
-            if progress_callback:
-                progress_callback(0.4, f"Installing {driver['name']} packages...")
-            
-            # Build install command
-            install_cmd = [
-                self.package_manager.sudo_command,
-                "pacman",
-                "-S",
-                "--noconfirm"
-            ]
-            install_cmd.extend(driver["packages"])
-            
-            # Execute install command
-            install_process = subprocess.Popen(
-                install_cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1
+            installed_conflicts = self.package_manager.filter_installed(
+                driver["conflicts"]
             )
-            
-            # Initialize progress tracking variables
-            downloading = False
-            installing = False
-            progress = 0.4
-            
-            # Process output
-            for line in iter(install_process.stdout.readline, ""):
-                # Parse progress information
-                if "Downloading" in line and "%" in line:
-                    downloading = True
-                    # Extract download percentage if possible
-                    match = re.search(r"\((\d+)/(\d+)\)", line)
-                    if match:
-                        current = int(match.group(1))
-                        total = int(match.group(2))
-                        progress = 0.4 + (current / total) * 0.3  # 40%-70% for downloading
-                        
-                        if progress_callback:
-                            progress_callback(progress, f"Downloading packages ({current}/{total})...")
-                
-                elif "Installing" in line:
-                    installing = True
-                    if progress_callback:
-                        progress_callback(0.7, "Installing packages...")
-                
-                elif installing and "installing" in line.lower():
-                    # Rough estimation of installation progress
-                    progress = min(0.7 + progress * 0.1, 0.9)  # 70%-90% for installing
-                    if progress_callback:
-                        progress_callback(progress, "Installing...")
-            
-            # Wait for completion
-            install_process.wait()
-            
-            # Check if successful
-            if install_process.returncode != 0:
+
+            # 1. Install the new packages, replacing conflicts in the same transaction
+            returncode = self._install_driver_packages(
+                driver, progress_callback, replace_conflicts=True
+            )
+            success = returncode == 0
+
+            if success:
+                # Remove conflicts pacman did not replace on its own
+                leftover = self.package_manager.filter_installed(installed_conflicts)
+                if leftover and not self._remove_conflicts(leftover, progress_callback):
+                    success = False
+
+            elif installed_conflicts and returncode not in _PKEXEC_ABORT_CODES:
+                # 2. Fall back to removing conflicts first, then installing
+                if not self._remove_conflicts(installed_conflicts, progress_callback):
+                    if complete_callback:
+                        complete_callback(False)
+                    return
+
+                success = self._install_driver_packages(driver, progress_callback) == 0
+
+            if not success:
                 if progress_callback:
                     progress_callback(0.0, "Failed to install packages.")
                 
@@ -267,4 +213,139 @@ class MesaManager:
                 progress_callback(0.0, f"Error: {str(e)}")
             
             if complete_callback:
-                complete_callback(False)
\ No newline at end of file
+                complete_callback(False)
+
+    def _remove_conflicts(self, packages, progress_callback):
+        """
+        Remove conflicting packages.
+
+        Args:
+            packages: Installed conflicting packages to remove.
+            progress_callback: Callback function for progress updates.
+
+        Returns:
+            bool: True if the removal succeeded, False otherwise.
+        """
+        if progress_callback:
+            progress_callback(0.2, "Removing conflicting packages...")
+        
+        # Build remove command
+        remove_cmd = [
+            self.package_manager.sudo_command,
+            "pacman",
+            "-Rs",
+            "--noconfirm"
+        ]
+        remove_cmd.extend(packages)
+        
+        # Execute remove command
+        remove_process = subprocess.Popen(
+            remove_cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            stdin=subprocess.DEVNULL,
+            env=self.package_manager.command_env
+        )
+        
+        # Process output (C locale, so keywords have a fixed case)
+        for line in iter_output_lines(remove_process.stdout):
+            if "removing" in line:
+                if progress_callback:
+                    progress_callback(0.3, "Removing conflicting packages...")
+        
+        # Wait for completion
+        remove_process.wait()
+        
+        # Check if successful
+        if remove_process.returncode != 0:
+            if progress_callback:
+                progress_callback(0.0, "Failed to remove conflicting packages.")
+            return False
+
+        return True
+
+    def _install_driver_packages(self, driver, progress_callback, replace_conflicts=False):
+        """
+        Install the packages of a driver.
+
+        Args:
+            driver: The driver configuration to install.
+            progress_callback: Callback function for progress updates.
+            replace_conflicts: Let pacman remove conflicting packages as part
+                of the same transaction.
+
+        Returns:
+            int: The pacman (or pkexec) exit code, 0 on success.
+        """
+        if progress_callback:
+            progress_callback(0.4, f"Installing {driver['name']} packages...")
+        
+        # Build install command
+        install_cmd = [
+            self.package_manager.sudo_command,
+            "pacman",
+            "-S",
+            "--noconfirm",
+            "--needed"
+        ]
+        if replace_conflicts:
+            # Answer "yes" to "Remove <conflicting package>?" (--noconfirm says no)
+            install_cmd.append("--ask=4")
+        install_cmd.extend(driver["packages"])
+        
+        # Execute install command
+        install_process = subprocess.Popen(
+            install_cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            stdin=subprocess.DEVNULL,
+            env=self.package_manager.command_env
+        )
+        
+        # Initialize progress tracking variables
+        installing = False
+        installed_count = 0
+        progress = 0.4
+        last_reported = None
+        
+        # Process output (C locale, so keywords have a fixed case)
+        for line in iter_output_lines(install_process.stdout):
+            # Parse progress information
+            if "Downloading" in line and "%" in line:
+                # Extract download percentage if possible
+                match = _PROGRESS_RE.search(line)
+                if not match:
+                    continue
+                current = int(match.group(1))
+                total = int(match.group(2))
+                progress = 0.4 + (current / total) * 0.3  # 40%-70% for downloading
+                phase = "download"
+                message = f"Downloading packages ({current}/{total})..."
+            
+            elif "Installing" in line:
+                installing = True
+                progress = 0.7
+                phase = "install"
+                message = "Installing packages..."
+            
+            elif installing and "installing" in line:
+                # Each installed package moves progress forward, 70%-90%
+                installed_count += 1
+                progress = min(0.7 + installed_count * 0.05, 0.9)
+                phase = "install"
+                message = "Installing..."
+            
+            else:
+                continue
+            
+            # Only report when progress moves to a new 5% step
+            report_key = (phase, int(progress * 20))
+            if report_key != last_reported:
+                last_reported = report_key
+                if progress_callback:
+                    progress_callback(progress, message)
+        
+        # Wait for completion
+        install_process.wait()
+
+        return install_process.returncode
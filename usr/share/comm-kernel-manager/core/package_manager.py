@@ -8,20 +8,344 @@ This module provides an interface to interact with pacman package manager
 for installing and managing packages.
 """
 
+import functools
 import os
 import re
+import selectors
+import signal
 import subprocess
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Size of each raw read from a subprocess pipe
+READ_CHUNK_SIZE = 65536
+
+# Single worker shared by every package, kernel and Mesa transaction: they
+# must run one at a time (pacman holds a db lock)
+_TRANSACTION_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pkgmgr")
+
+# "repo/name version" header lines of pacman -Ss output (description
+# lines are indented, so the line anchor skips them)
+_AVAIL_RE = re.compile(rb"^([^\s/]+)/(\S+)[ \t]+(\S+)", re.MULTILINE)
+
+# "name version" lines of pacman -Q output
+_INSTALLED_RE = re.compile(rb"^(\S+)[ \t]+(\S+)", re.MULTILINE)
+
+# Classifies a raw (undecoded) pacman output line in one pass; the named
+# group that matched tells which kind of line it is:
+#   sync     - database synchronization
+#   download - a package being downloaded, with the "(current/total)"
+#              counter in current/total when present
+#   stage    - start of the installation stage
+#   step     - a single package being installed
+_LINE_RE = re.compile(
+    rb"(?P<sync>Synchronizing package databases)"
+    rb"|(?P<download>(?i:downloading))(?:.*?\((?P<current>\d+)/(?P<total>\d+)\))?"
+    rb"|(?P<stage>Installing)"
+    rb"|(?P<step>(?i:installing))"
+)
+
+
+# Lines pacman prints once its transaction is under way; a cancel request
+# is refused from the first of them on
+_TRANSACTION_START_RE = re.compile(rb"(?i:checking|installing|upgrading|removing)")
+_TRANSACTION_START_STR_RE = re.compile(_TRANSACTION_START_RE.pattern.decode())
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_pattern(pattern):
+    """
+    Compile a caller-supplied package name filter, once per pattern.
+
+    Args:
+        pattern: Regex pattern string.
+
+    Returns:
+        re.Pattern: The compiled pattern.
+    """
+    return re.compile(pattern)
+
+
+def _parse_names(output):
+    """Parse pacman -Qq/-Ssq output into a tuple of package names."""
+    return tuple(output.decode("utf-8", errors="replace").splitlines())
+
+
+def _parse_installed(output):
+    """Parse pacman -Q output into a tuple of (name, version) pairs."""
+    return tuple(
+        (name.decode(), version.decode())
+        for name, version in _INSTALLED_RE.findall(output)
+    )
+
+
+def _parse_available(output):
+    """Parse the header lines of pacman -Ss output into (repo, name, version) tuples."""
+    # Only the captured fields are decoded; description lines stay bytes
+    return tuple(
+        (repo.decode(), name.decode(), version.decode())
+        for repo, name, version in _AVAIL_RE.findall(output)
+    )
+
+
+def _db_state(paths):
+    """
+    Get the modification times of pacman database files.
+
+    Args:
+        paths: Paths to stat.
+
+    Returns:
+        tuple: (path, st_mtime_ns) pairs, or None if a path is missing.
+    """
+    try:
+        return tuple((path, os.stat(path).st_mtime_ns) for path in paths)
+    except OSError:
+        return None
+
+
+def submit_transaction(fn, *args):
+    """
+    Queue a pacman transaction on the shared transaction worker.
+
+    Args:
+        fn: Function running the transaction.
+        *args: Arguments passed to fn.
+
+    Returns:
+        concurrent.futures.Future: Completes when the transaction has ended.
+    """
+    return _TRANSACTION_POOL.submit(fn, *args)
+
+
+def cancel_pending_transactions():
+    """
+    Drop the transactions still waiting for the transaction worker.
+
+    Called when the application shuts down; a transaction already running
+    is left to finish so pacman is never stopped halfway.
+    """
+    _TRANSACTION_POOL.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_output_batches(
+    stream, chunk_size=READ_CHUNK_SIZE, idle_timeout=None, decode=True
+):
+    """
+    Iterate over the lines of a binary subprocess pipe, one read at a time.
+
+    Reads the pipe in large chunks and splits lines in Python, instead of
+    issuing one read per line.
+
+    Args:
+        stream: Binary file object (e.g. Popen.stdout opened without text mode).
+        chunk_size: Maximum number of bytes to read at once.
+        idle_timeout: If set, seconds to wait for output before yielding an
+            empty batch, so callers can act while the process is silent.
+        decode: Decode lines as UTF-8; pass False to get the raw bytes when
+            the lines are only classified and never shown.
+
+    Yields:
+        list: Lines completed by each read, without trailing newlines.
+    """
+    fd = stream.fileno()
+    remainder = b""
+    selector = None
+    if idle_timeout is not None:
+        selector = selectors.DefaultSelector()
+        selector.register(fd, selectors.EVENT_READ)
+    try:
+        while True:
+            if selector is not None and not selector.select(idle_timeout):
+                yield []
+                continue
+            chunk = os.read(fd, chunk_size)
+            if not chunk:
+                break
+            lines = (remainder + chunk).split(b"\n")
+            remainder = lines.pop()
+            if lines:
+                if decode:
+                    lines = [line.decode("utf-8", errors="replace") for line in lines]
+                yield lines
+    finally:
+        if selector is not None:
+            selector.close()
+    if remainder:
+        yield [remainder.decode("utf-8", errors="replace") if decode else remainder]
+
+
+def iter_output_lines(stream, chunk_size=READ_CHUNK_SIZE):
+    """
+    Iterate over the lines of a binary subprocess pipe.
+
+    Args:
+        stream: Binary file object (e.g. Popen.stdout opened without text mode).
+        chunk_size: Maximum number of bytes to read at once.
+
+    Yields:
+        str: Decoded lines, without the trailing newline.
+    """
+    for lines in iter_output_batches(stream, chunk_size):
+        yield from lines
+
+
+def terminate_process(process, timeout=5):
+    """
+    Ask a subprocess to stop and wait briefly for it to exit.
+
+    Sends SIGINT, which pacman handles by releasing its database lock
+    before exiting (SIGTERM would leave a stale db.lck behind).
+
+    Args:
+        process: The subprocess.Popen object to stop.
+        timeout: Seconds to wait for the process to exit.
+
+    Returns:
+        bool: True if the process has exited, False otherwise.
+    """
+    try:
+        process.send_signal(signal.SIGINT)
+        process.wait(timeout=timeout)
+        return True
+    except (OSError, subprocess.TimeoutExpired) as e:
+        # An elevated process may not accept signals from us
+        print(f"Could not stop process {process.pid}: {e}")
+        return False
+
+
+class CancelWatcher:
+    """
+    Applies a cancel request to a running pacman process, when it is safe.
+
+    A cancel is only honoured until pacman starts its transaction (its
+    first "checking"/"installing"/... line); after that, or when pacman
+    does not accept our signal, the request is refused and the caller
+    keeps draining the output so pacman never blocks on a full pipe.
+    """
+
+    __slots__ = ("process", "cancel_event", "started")
+
+    # Result of poll()
+    STOPPED = "stopped"
+    REFUSED = "refused"
+
+    def __init__(self, process, cancel_event):
+        """
+        Initialize the watcher.
+
+        Args:
+            process: The pacman subprocess.Popen object.
+            cancel_event: threading.Event set to request a cancel, or None.
+        """
+        self.process = process
+        self.cancel_event = cancel_event
+        self.started = False
+
+    def poll(self, lines):
+        """
+        Check for a cancel request after a batch of output has been read.
+
+        Args:
+            lines: The batch just read (str or bytes lines).
+
+        Returns:
+            str: STOPPED if pacman was stopped, REFUSED if a cancel request
+                could not be honoured, None otherwise.
+        """
+        if self.cancel_event is None:
+            return None
+
+        if not self.started:
+            for line in lines:
+                pattern = (
+                    _TRANSACTION_START_RE
+                    if isinstance(line, bytes)
+                    else _TRANSACTION_START_STR_RE
+                )
+                if pattern.search(line):
+                    self.started = True
+                    break
+
+        if not self.cancel_event.is_set():
+            return None
+
+        # Each request is answered once
+        self.cancel_event = None
+        if not self.started and terminate_process(self.process):
+            return self.STOPPED
+        return self.REFUSED
+
+
+class _ProgressThrottle:
+    """
+    Rate limiter for progress callbacks fed from pacman output.
+
+    An update is passed on when the progress crosses a whole percent, when
+    its text changes, or when the last one is older than MIN_INTERVAL;
+    anything else is dropped, since a newer update follows right after it.
+    Final results are reported with the plain callback so they are never
+    dropped.
+    """
+
+    __slots__ = ("callback", "_last_emit", "_last_key")
+
+    # Minimum interval between repeated updates (seconds, ~30 Hz)
+    MIN_INTERVAL = 0.033
+
+    def __init__(self, callback):
+        """
+        Initialize the throttle.
+
+        Args:
+            callback: Progress callback taking (fraction, text).
+        """
+        self.callback = callback
+        self._last_emit = 0.0
+        # Last update passed on, as (whole percent, text)
+        self._last_key = None
+
+    def __call__(self, fraction, text=None):
+        """
+        Pass an update on to the callback unless it is redundant.
+
+        Args:
+            fraction: Progress value between 0.0 and 1.0.
+            text: Status text (optional).
+        """
+        now = time.monotonic()
+        key = (int(fraction * 100), text)
+        if key == self._last_key and now - self._last_emit < self.MIN_INTERVAL:
+            return
+        self._last_emit = now
+        self._last_key = key
+        self.callback(fraction, text)
 
 
 class PackageManager:
     """Interface for the pacman package manager."""
 
+    # pacman databases; their modification times tell when cached query
+    # results are out of date
+    LOCAL_DB_PATH = "/var/lib/pacman/local"
+    SYNC_DB_DIR = "/var/lib/pacman/sync"
+
     def __init__(self):
         """Initialize the package manager."""
         self.sudo_command = "pkexec"  # Using polkit for privilege escalation
 
+        # Environment for pacman processes: C locale so output parsing
+        # does not depend on the user's language
+        self.command_env = os.environ.copy()
+        self.command_env["LANG"] = "C"
+        self.command_env["LC_ALL"] = "C"
+
+        # Parsed query results by command, with the database state they
+        # were read at: {cmd: (db_state, result)}
+        self._query_cache = {}
+        self._query_lock = threading.Lock()
+
     def get_installed_packages(self, pattern=None):
         """
         Get a list of installed packages.
@@ -30,32 +354,29 @@ class PackageManager:
             pattern: Optional regex pattern to filter packages.
 
         Returns:
-            list: List of installed packages.
+            list: List of installed packages (dicts).
         """
-        cmd = ["pacman", "-Q"]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=False)
-
-        if result.returncode != 0:
+        # Package names and versions, parsed in one pass over the output
+        pairs = self._query(["pacman", "-Q"], self._local_db_state(), _parse_installed)
+        if pairs is None:
             return []
 
-        packages = []
-        for line in result.stdout.strip().split("\n"):
-            if not line:
-                continue
-
-            # Parse package name and version
-            parts = line.split()
-            if len(parts) >= 2:
-                package_name = parts[0]
-                package_version = parts[1]
+        # Apply pattern filter if provided
+        if pattern:
+            pattern_re = _compile_pattern(pattern)
+            pairs = [pair for pair in pairs if pattern_re.search(pair[0])]
 
-                # Apply pattern filter if provided
-                if pattern and not re.search(pattern, package_name):
-                    continue
+        return [{"name": name, "version": version} for name, version in pairs]
 
-                packages.append({"name": package_name, "version": package_version})
+    def get_installed_package_names(self):
+        """
+        Get the names of all installed packages.
 
-        return packages
+        Returns:
+            set: Set of installed package names.
+        """
+        names = self._query(["pacman", "-Qq"], self._local_db_state(), _parse_names)
+        return set(names) if names is not None else set()
 
     def get_available_packages(self, pattern=None):
         """
@@ -65,60 +386,110 @@ class PackageManager:
             pattern: Optional regex pattern to filter packages.
 
         Returns:
-            list: List of available packages.
+            list: List of available packages (dicts).
         """
         cmd = ["pacman", "-Ss"]
         if pattern:
             cmd.append(pattern)
 
-        result = subprocess.run(cmd, capture_output=True, text=True, check=False)
-
-        if result.returncode != 0:
+        entries = self._query(cmd, self._sync_db_state(), _parse_available)
+        if entries is None:
             return []
 
-        packages = []
-        current_package = None
+        return [
+            {"name": name, "version": version, "repository": repo}
+            for repo, name, version in entries
+        ]
 
-        for line in result.stdout.strip().split("\n"):
-            if not line:
-                continue
+    def _query(self, cmd, db_state, parse):
+        """
+        Run a read-only pacman query, reusing the last result when possible.
 
-            # New package entry starts with repo/name version
-            if line.startswith(" "):
-                # This is a description line, skip
-                continue
+        Args:
+            cmd: Command to run.
+            db_state: State of the databases the query reads, from
+                _local_db_state or _sync_db_state; None disables caching.
+            parse: Function turning the raw (bytes) command output into an
+                immutable result.
 
-            # Parse package information
-            match = re.match(r"([^\s]+)/([^\s]+)\s+([^\s]+)", line)
-            if match:
-                repo = match.group(1)
-                package_name = match.group(2)
-                package_version = match.group(3)
+        Returns:
+            The parsed output, or None if the command failed.
+        """
+        key = tuple(cmd)
+        if db_state is not None:
+            with self._query_lock:
+                cached = self._query_cache.get(key)
+            if cached is not None and cached[0] == db_state:
+                return cached[1]
+
+        # Output is kept as bytes; the parser decodes only what it keeps
+        result = subprocess.run(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=False
+        )
+        if result.returncode != 0:
+            return None
+
+        parsed = parse(result.stdout)
+        if db_state is not None:
+            with self._query_lock:
+                self._query_cache[key] = (db_state, parsed)
+        return parsed
+
+    def _local_db_state(self):
+        """
+        Get the state of the local (installed packages) database.
+
+        Returns:
+            tuple: (path, mtime) pairs, or None if the database is missing.
+        """
+        return _db_state((self.LOCAL_DB_PATH,))
 
-                packages.append({
-                    "name": package_name,
-                    "version": package_version,
-                    "repository": repo,
-                })
+    def _sync_db_state(self):
+        """
+        Get the state of the repository sync databases.
 
-        return packages
+        Returns:
+            tuple: (path, mtime) pairs, or None if they cannot be read.
+        """
+        try:
+            paths = sorted(
+                entry.path
+                for entry in os.scandir(self.SYNC_DB_DIR)
+                if entry.name.endswith(".db")
+            )
+        except OSError:
+            return None
+        return _db_state(paths) if paths else None
 
-    def is_package_installed(self, package_name):
+    def filter_installed(self, package_names):
         """
-        Check if a package is installed.
+        Filter a list of packages down to the ones that are installed.
+
+        Uses a single pacman query for all names instead of one per package.
 
         Args:
-            package_name: Name of the package.
+            package_names: Iterable of package names to check.
 
         Returns:
-            bool: True if the package is installed, False otherwise.
+            list: Installed package names, in the order they were given.
         """
-        cmd = ["pacman", "-Q", package_name]
+        package_names = list(package_names)
+        if not package_names:
+            return []
+
+        # pacman exits non-zero when any name is missing, so ignore the code
+        cmd = ["pacman", "-Qq"] + package_names
         result = subprocess.run(cmd, capture_output=True, text=True, check=False)
-        return result.returncode == 0
+
+        installed = set(result.stdout.splitlines())
+        return [name for name in package_names if name in installed]
 
     def install_package(
-        self, package_name, progress_callback=None, complete_callback=None
+        self,
+        package_name,
+        progress_callback=None,
+        complete_callback=None,
+        cancel_event=None,
     ):
         """
         Install a package using pacman.
@@ -127,16 +498,23 @@ class PackageManager:
             package_name: Name of the package to install.
             progress_callback: Callback function for progress updates.
             complete_callback: Callback function for completion notification.
+            cancel_event: Optional threading.Event; setting it stops pacman
+                if its transaction has not started yet.
+
+        Returns:
+            concurrent.futures.Future: Completes when the transaction has ended.
         """
-        # Run installation in a separate thread
-        threading.Thread(
-            target=self._install_package_thread,
-            args=(package_name, progress_callback, complete_callback),
-            daemon=True,
-        ).start()
+        # Run installation on the transaction worker thread
+        return submit_transaction(
+            self._install_package_thread,
+            package_name,
+            progress_callback,
+            complete_callback,
+            cancel_event,
+        )
 
     def _install_package_thread(
-        self, package_name, progress_callback, complete_callback
+        self, package_name, progress_callback, complete_callback, cancel_event=None
     ):
         """
         Thread function for package installation.
@@ -145,6 +523,8 @@ class PackageManager:
             package_name: Name of the package to install.
             progress_callback: Callback function for progress updates.
             complete_callback: Callback function for completion notification.
+            cancel_event: Optional threading.Event; setting it stops pacman
+                if its transaction has not started yet.
         """
         if progress_callback:
             progress_callback(0.1, f"Installing {package_name}...")
@@ -158,44 +538,64 @@ class PackageManager:
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
+                stdin=subprocess.DEVNULL,
+                env=self.command_env,
             )
 
             # Initialize progress tracking variables
-            download_size = None
-            downloaded = 0
             installing = False
             progress = 0.1
 
-            # Process output line by line
-            for line in iter(process.stdout.readline, ""):
-                # Parse progress information
-                if "Downloading" in line and "%" in line:
-                    # Extract download percentage
-                    match = re.search(r"\((\d+)/(\d+)\)", line)
-                    if match:
-                        current = int(match.group(1))
-                        total = int(match.group(2))
-                        progress = (
-                            0.1 + (current / total) * 0.4
-                        )  # 10%-50% for downloading
-
+            # Progress updates from the output are rate limited
+            report = _ProgressThrottle(progress_callback)
+
+            # Cancel requests are honoured until pacman starts its transaction
+            watcher = CancelWatcher(process, cancel_event)
+
+            # Process output in large reads, waking up periodically while
+            # pacman is silent so a cancellation is noticed
+            # (the lines are only classified, so they are left undecoded)
+            for lines in iter_output_batches(
+                process.stdout, idle_timeout=0.5, decode=False
+            ):
+                status = watcher.poll(lines)
+                if status == CancelWatcher.STOPPED:
+                    break
+                if status == CancelWatcher.REFUSED and progress_callback:
+                    progress_callback(
+                        progress, "Cannot cancel now, waiting for pacman to finish..."
+                    )
+
+                for line in lines:
+                    # Classify the line with a single regex pass
+                    match = _LINE_RE.search(line)
+                    if match is None:
+                        continue
+
+                    if match["download"]:
+                        # Extract the package counter if present
+                        if match["current"]:
+                            current = int(match["current"])
+                            total = int(match["total"])
+                            progress = (
+                                0.1 + (current / total) * 0.4
+                            )  # 10%-50% for downloading
+
+                            if progress_callback:
+                                report(
+                                    progress, f"Downloading packages ({current}/{total})..."
+                                )
+
+                    elif match["stage"]:
+                        installing = True
                         if progress_callback:
-                            progress_callback(
-                                progress, f"Downloading packages ({current}/{total})..."
-                            )
-
-                elif "Installing" in line:
-                    installing = True
-                    if progress_callback:
-                        progress_callback(0.5, "Installing packages...")
+                            report(0.5, "Installing packages...")
 
-                elif installing and "installing" in line.lower():
-                    # Rough estimation of installation progress
-                    progress = min(0.5 + progress * 0.1, 0.9)  # 50%-90% for installing
-                    if progress_callback:
-                        progress_callback(progress, "Installing...")
+                    elif installing and match["step"]:
+                        # Rough estimation of installation progress
+                        progress = min(0.5 + progress * 0.1, 0.9)  # 50%-90% for installing
+                        if progress_callback:
+                            report(progress, "Installing...")
 
             # Wait for process to complete
             process.wait()
@@ -223,7 +623,11 @@ class PackageManager:
                 complete_callback(False)
 
     def remove_package(
-        self, package_name, progress_callback=None, complete_callback=None
+        self,
+        package_name,
+        progress_callback=None,
+        complete_callback=None,
+        cancel_event=None,
     ):
         """
         Remove a package using pacman.
@@ -232,16 +636,23 @@ class PackageManager:
             package_name: Name of the package to remove.
             progress_callback: Callback function for progress updates.
             complete_callback: Callback function for completion notification.
+            cancel_event: Optional threading.Event; setting it stops pacman
+                if its transaction has not started yet.
+
+        Returns:
+            concurrent.futures.Future: Completes when the transaction has ended.
         """
-        # Run removal in a separate thread
-        threading.Thread(
-            target=self._remove_package_thread,
-            args=(package_name, progress_callback, complete_callback),
-            daemon=True,
-        ).start()
+        # Run removal on the transaction worker thread
+        return submit_transaction(
+            self._remove_package_thread,
+            package_name,
+            progress_callback,
+            complete_callback,
+            cancel_event,
+        )
 
     def _remove_package_thread(
-        self, package_name, progress_callback, complete_callback
+        self, package_name, progress_callback, complete_callback, cancel_event=None
     ):
         """
         Thread function for package removal.
@@ -250,6 +661,8 @@ class PackageManager:
             package_name: Name of the package to remove.
             progress_callback: Callback function for progress updates.
             complete_callback: Callback function for completion notification.
+            cancel_event: Optional threading.Event; setting it stops pacman
+                if its transaction has not started yet.
         """
         if progress_callback:
             progress_callback(0.1, f"Removing {package_name}...")
@@ -263,16 +676,35 @@ class PackageManager:
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
+                stdin=subprocess.DEVNULL,
+                env=self.command_env,
             )
 
-            # Process output line by line
-            for line in iter(process.stdout.readline, ""):
-                # Update progress (simple approximation)
-                if "removing" in line.lower():
-                    if progress_callback:
-                        progress_callback(0.5, "Removing packages...")
+            # Progress updates from the output are rate limited
+            report = _ProgressThrottle(progress_callback)
+
+            # Cancel requests are honoured until pacman starts its transaction
+            watcher = CancelWatcher(process, cancel_event)
+
+            # Process output in large reads, waking up periodically while
+            # pacman is silent so a cancellation is noticed
+            # (the lines are only classified, so they are left undecoded)
+            for lines in iter_output_batches(
+                process.stdout, idle_timeout=0.5, decode=False
+            ):
+                status = watcher.poll(lines)
+                if status == CancelWatcher.STOPPED:
+                    break
+                if status == CancelWatcher.REFUSED and progress_callback:
+                    progress_callback(
+                        0.5, "Cannot cancel now, waiting for pacman to finish..."
+                    )
+
+                for line in lines:
+                    # Update progress (simple approximation)
+                    if b"removing" in line.lower():
+                        if progress_callback:
+                            report(0.5, "Removing packages...")
 
             # Wait for process to complete
             process.wait()
@@ -299,28 +731,40 @@ class PackageManager:
             if complete_callback:
                 complete_callback(False)
 
-    def update_system(self, progress_callback=None, complete_callback=None):
+    def update_system(
+        self, progress_callback=None, complete_callback=None, cancel_event=None
+    ):
         """
         Update the entire system.
 
         Args:
             progress_callback: Callback function for progress updates.
             complete_callback: Callback function for completion notification.
-        """
-        # Run system update in a separate thread
-        threading.Thread(
-            target=self._update_system_thread,
-            args=(progress_callback, complete_callback),
-            daemon=True,
-        ).start()
+            cancel_event: Optional threading.Event; setting it stops pacman
+                if its transaction has not started yet.
 
-    def _update_system_thread(self, progress_callback, complete_callback):
+        Returns:
+            concurrent.futures.Future: Completes when the transaction has ended.
+        """
+        # Run system update on the transaction worker thread
+        return submit_transaction(
+            self._update_system_thread,
+            progress_callback,
+            complete_callback,
+            cancel_event,
+        )
+
+    def _update_system_thread(
+        self, progress_callback, complete_callback, cancel_event=None
+    ):
         """
         Thread function for system update.
 
         Args:
             progress_callback: Callback function for progress updates.
             complete_callback: Callback function for completion notification.
+            cancel_event: Optional threading.Event; setting it stops pacman
+                if its transaction has not started yet.
         """
         if progress_callback:
             progress_callback(0.0, "Updating system...")
@@ -334,8 +778,8 @@ class PackageManager:
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
+                stdin=subprocess.DEVNULL,
+                env=self.command_env,
             )
 
             # Initialize progress tracking variables
@@ -343,39 +787,61 @@ class PackageManager:
             installing = False
             progress = 0.0
 
-            # Process output line by line
-            for line in iter(process.stdout.readline, ""):
-                # Parse progress information
-                if "Synchronizing package databases" in line:
-                    if progress_callback:
-                        progress_callback(0.1, "Synchronizing package databases...")
-
-                elif "Downloading" in line and "%" in line:
-                    downloading = True
-                    # Extract download percentage if possible
-                    match = re.search(r"\((\d+)/(\d+)\)", line)
-                    if match:
-                        current = int(match.group(1))
-                        total = int(match.group(2))
-                        progress = (
-                            0.1 + (current / total) * 0.4
-                        )  # 10%-50% for downloading
-
+            # Progress updates from the output are rate limited
+            report = _ProgressThrottle(progress_callback)
+
+            # Cancel requests are honoured until pacman starts its transaction
+            watcher = CancelWatcher(process, cancel_event)
+
+            # Process output in large reads, waking up periodically while
+            # pacman is silent so a cancellation is noticed
+            # (the lines are only classified, so they are left undecoded)
+            for lines in iter_output_batches(
+                process.stdout, idle_timeout=0.5, decode=False
+            ):
+                status = watcher.poll(lines)
+                if status == CancelWatcher.STOPPED:
+                    break
+                if status == CancelWatcher.REFUSED and progress_callback:
+                    progress_callback(
+                        progress, "Cannot cancel now, waiting for pacman to finish..."
+                    )
+
+                for line in lines:
+                    # Classify the line with a single regex pass
+                    match = _LINE_RE.search(line)
+                    if match is None:
+                        continue
+
+                    if match["sync"]:
                         if progress_callback:
-                            progress_callback(
-                                progress, f"Downloading packages ({current}/{total})..."
-                            )
-
-                elif "Installing" in line:
-                    installing = True
-                    if progress_callback:
-                        progress_callback(0.5, "Installing packages...")
+                            report(0.1, "Synchronizing package databases...")
+
+                    elif match["download"]:
+                        downloading = True
+                        # Extract download percentage if possible
+                        if match["current"]:
+                            current = int(match["current"])
+                            total = int(match["total"])
+                            progress = (
+                                0.1 + (current / total) * 0.4
+                            )  # 10%-50% for downloading
+
+                            if progress_callback:
+                                report(
+                                    progress, f"Downloading packages ({current}/{total})..."
+                                )
+
+                    elif match["stage"]:
+                        installing = True
+                        if progress_callback:
+                            report(0.5, "Installing packages...")
 
-                elif installing and "installing" in line.lower():
-                    # Rough estimation of installation progress
-                    progress = min(0.5 + progress * 0.1, 0.9)  # 50%-90% for installing
-                    if progress_callback:
-                        progress_callback(progress, "Installing...")
+                    elif installing and match["step"]:
+                        # Rough estimation of installation progress
+                        progress = min(0.5 + progress * 0.1, 0.9)  # 50%-90% for installing
+                        if progress_callback:
+                            report(progress, "Installing...")
 
             # Wait for process to complete
             process.wait()
@@ -401,3 +867,24 @@ class PackageManager:
 
             if complete_callback:
                 complete_callback(False)
+
+
+# Instance shared by every component, created on first use
+_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_package_manager():
+    """
+    Get the PackageManager shared by the whole application.
+
+    Sharing one instance lets every page reuse the same query caches.
+
+    Returns:
+        PackageManager: The shared instance.
+    """
+    global _instance
+    with _instance_lock:
+        if _instance is None:
+            _instance = PackageManager()
+        return _instance
@@ -12,48 +12,86 @@ import json
 import gi
 gi.require_version('Gtk', '4.0')
 gi.require_version('Adw', '1')
-from gi.repository import Gtk, Gio, Adw, Gdk
+from gi.repository import Gtk, Gio, Adw, Gdk, GLib
 
+from core.package_manager import cancel_pending_transactions, get_package_manager
 from ui.window import KernelManagerWindow
 
 
 class SettingsManager:
     """Settings manager for the Kernel Manager application."""
+
+    # Delay before pending changes are written to disk (milliseconds)
+    SAVE_DELAY_MS = 250
     
     def __init__(self):
         """Initialize the settings manager."""
         self.settings_file = os.path.expanduser("~/.config/kernel-manager/settings.json")
         os.makedirs(os.path.dirname(self.settings_file), exist_ok=True)
         self.json_config = self._load_settings()
+        self._dirty = False
+        self._flush_source = None
     
     def _load_settings(self):
-        """Load settings from file."""
-        if os.path.exists(self.settings_file):
-            try:
-                with open(self.settings_file, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"Error loading settings: {e}")
+        """Load settings from file (read once at startup)."""
+        try:
+            with open(self.settings_file, 'rb') as f:
+                data = f.read()
+            return json.loads(data) if data else {}
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error loading settings: {e}")
         return {}
     
     def _save_settings(self):
-        """Save settings to file."""
+        """Save settings to file atomically."""
+        tmp_file = self.settings_file + ".tmp"
         try:
-            with open(self.settings_file, 'w') as f:
-                json.dump(self.json_config, f, indent=2)
+            data = json.dumps(self.json_config, separators=(",", ":")).encode()
+            fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+            os.replace(tmp_file, self.settings_file)
             return True
         except Exception as e:
             print(f"Error saving settings: {e}")
+            # Never leave a half-written temp file behind
+            try:
+                os.unlink(tmp_file)
+            except OSError:
+                pass
             return False
+
+    def _flush(self):
+        """Timeout callback that writes pending changes."""
+        self._flush_source = None
+        self.flush()
+        return False  # Don't call again
+
+    def flush(self):
+        """Write pending changes to disk immediately."""
+        if self._flush_source is not None:
+            GLib.source_remove(self._flush_source)
+            self._flush_source = None
+        if not self._dirty:
+            return True
+        self._dirty = False
+        return self._save_settings()
     
     def load_setting(self, key, default=None):
         """Load a setting value."""
         return self.json_config.get(key, default)
     
     def save_setting(self, key, value):
-        """Save a setting value."""
+        """Save a setting value (written to disk shortly after)."""
         self.json_config[key] = value
-        return self._save_settings()
+        self._dirty = True
+        if self._flush_source is None:
+            self._flush_source = GLib.timeout_add(self.SAVE_DELAY_MS, self._flush)
+        return True
 
 
 class KernelManagerApplication(Adw.Application):
@@ -64,22 +102,25 @@ class KernelManagerApplication(Adw.Application):
         super().__init__(application_id="org.manjaro.kernelmanager",
                          flags=Gio.ApplicationFlags.FLAGS_NONE)
         self.connect("activate", self.on_activate)
+        self.connect("shutdown", self.on_shutdown)
         
         # Initialize settings manager
         self.settings_manager = SettingsManager()
+
+        # Package manager shared by all pages
+        self.package_manager = get_package_manager()
         
-        # Load custom CSS
-        self._load_css()  # Adicionada esta linha
+        # Error dialog, created on first use
+        self._error_dialog = None
 
     def _load_css(self):
         """Load custom CSS styling from file."""
-        css_provider = Gtk.CssProvider()
-        
         # Get the path to the CSS file
         base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         css_path = os.path.join(base_dir, "assets", "css", "style.css")
         
         try:
+            css_provider = Gtk.CssProvider()
             css_provider.load_from_path(css_path)
             Gtk.StyleContext.add_provider_for_display(
                 Gdk.Display.get_default(),
@@ -89,6 +130,7 @@ class KernelManagerApplication(Adw.Application):
             print(f"Loaded CSS from {css_path}")
         except Exception as e:
             print(f"Error loading CSS: {e}")
+        return False  # Don't call again
 
     def on_activate(self, app):
         """
@@ -97,16 +139,58 @@ class KernelManagerApplication(Adw.Application):
         Args:
             app: The application instance.
         """
+        # A second launch only raises the existing window
+        win = self.get_active_window()
+        if win is not None:
+            win.present()
+            return
+
         # Create the main window and present it
         win = KernelManagerWindow(application=app)
         win.present()
+
+        # Load custom CSS once the window is on screen
+        GLib.idle_add(self._load_css)
+
+    def on_shutdown(self, app):
+        """
+        Callback for the application shutdown.
+
+        Args:
+            app: The application instance.
+        """
+        # Write any settings change still waiting for its timer
+        self.settings_manager.flush()
+
+        # Queued pacman transactions must not start after the window is gone
+        cancel_pending_transactions()
         
     def show_error_dialog(self, message):
         """Show an error dialog with the given message."""
-        dialog = Adw.MessageDialog.new(self.get_active_window())
-        dialog.set_heading("Error")
-        dialog.set_body(message)
-        dialog.add_response("ok", "OK")
-        dialog.set_default_response("ok")
-        dialog.set_close_response("ok")
-        dialog.present()
\ No newline at end of file
+        # The reused dialog may itself be the active window; never make it
+        # its own parent
+        parent = self.props.active_window
+        if parent is None or parent is self._error_dialog:
+            parent = next(
+                (
+                    window
+                    for window in self.get_windows()
+                    if isinstance(window, KernelManagerWindow)
+                ),
+                None,
+            )
+
+        # Build the dialog once and reuse it for later errors
+        if self._error_dialog is None:
+            dialog = Adw.MessageDialog.new(parent)
+            dialog.set_heading("Error")
+            dialog.add_response("ok", "OK")
+            dialog.set_default_response("ok")
+            dialog.set_close_response("ok")
+            dialog.set_hide_on_close(True)
+            self._error_dialog = dialog
+        else:
+            self._error_dialog.set_transient_for(parent)
+
+        self._error_dialog.set_body(message)
+        self._error_dialog.present()
\ No newline at end of file
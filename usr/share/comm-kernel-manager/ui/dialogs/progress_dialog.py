@@ -8,6 +8,7 @@ This module defines a reusable modal progress dialog for
 operations like kernel installation and removal.
 """
 
+import threading
 import gi
 
 gi.require_version("Gtk", "4.0")
@@ -15,9 +16,80 @@ gi.require_version("Adw", "1")
 from gi.repository import Gtk, Adw, GLib
 
 
+class ProgressThrottler:
+    """
+    Coalesces progress updates into throttled redraws on the main loop.
+
+    Updates may come from worker threads; only the latest one is passed to
+    the draw function, at most once per interval.
+    """
+
+    __slots__ = ("_draw", "_interval_ms", "_pending", "_lock", "_source")
+
+    def __init__(self, draw, interval_ms=33):
+        """
+        Initialize the throttler.
+
+        Args:
+            draw: Function called as draw(fraction, text) on the main loop
+            interval_ms: Minimum interval between draws (milliseconds)
+        """
+        self._draw = draw
+        self._interval_ms = interval_ms
+
+        # Latest update waiting to be drawn (fraction, text)
+        self._pending = None
+        self._lock = threading.Lock()
+        self._source = None
+
+    def push(self, fraction, text=None):
+        """
+        Queue a progress update, replacing any update not yet drawn.
+
+        Args:
+            fraction: Progress value between 0.0 and 1.0
+            text: Status text (optional)
+        """
+        with self._lock:
+            # Keep a pending status text if this update has none
+            if text is None and self._pending is not None:
+                text = self._pending[1]
+            self._pending = (fraction, text)
+            if self._source is None:
+                self._source = GLib.timeout_add(self._interval_ms, self._drain)
+
+    def _drain(self):
+        """Draw the latest pending progress update."""
+        with self._lock:
+            pending = self._pending
+            self._pending = None
+            self._source = None
+
+        if pending is not None:
+            self._draw(*pending)
+        return False  # Don't call again
+
+    def cancel(self):
+        """Discard a progress update that has not been drawn yet."""
+        with self._lock:
+            if self._source is not None:
+                GLib.source_remove(self._source)
+                self._source = None
+            self._pending = None
+
+
 class ProgressDialog:
     """Modal dialog for showing operation progress."""
 
+    # Interval for writing queued terminal output to the buffer (milliseconds)
+    OUTPUT_FLUSH_MS = 50
+
+    # Minimum interval between progress bar redraws (milliseconds, ~30 Hz)
+    PROGRESS_UPDATE_MS = 33
+
+    # Maximum number of characters kept in the terminal buffer
+    MAX_TERMINAL_CHARS = 256 * 1024
+
     def __init__(
         self,
         parent_window,
@@ -43,6 +115,24 @@ class ProgressDialog:
         self.complete_callback = complete_callback
         self.cancel_callback = cancel_callback
 
+        # Terminal output queued for the next flush (may be fed from threads)
+        self._pending_output = []
+        self._output_lock = threading.Lock()
+        self._output_source = None
+
+        # Progress updates, drawn at most about 30 times per second
+        self._progress = ProgressThrottler(self._set_progress, self.PROGRESS_UPDATE_MS)
+
+        # Texts currently shown, to skip redundant widget updates
+        self._last_progress_text = None
+        self._last_status_text = None
+
+        # Last drawn update, as (fraction in tenths of a percent, text)
+        self._last_drawn = None
+
+        # Set by destroy(); late updates from worker threads are dropped
+        self._closed = False
+
         # Create modal window
         self.window = Adw.Window()
         self.window.set_modal(True)
@@ -120,6 +210,11 @@ class ProgressDialog:
         self.terminal_view.set_bottom_margin(8)
         self.terminal_buffer = self.terminal_view.get_buffer()
 
+        # Mark that stays at the end of the buffer, used for auto-scroll
+        self._end_mark = self.terminal_buffer.create_mark(
+            None, self.terminal_buffer.get_end_iter(), False
+        )
+
         terminal_scroll.set_child(self.terminal_view)
         frame.set_child(terminal_scroll)
         content.append(frame)
@@ -146,12 +241,37 @@ class ProgressDialog:
         """
         Update the progress bar and status label.
 
+        Updates are throttled: only the latest one is drawn, at most about
+        30 times per second. Safe to call from worker threads.
+
         Args:
             fraction: Progress value between 0.0 and 1.0
             text: Status text (optional)
         """
+        if self._closed:
+            return
+        self._progress.push(fraction, text)
+
+    def _set_progress(self, fraction, text):
+        """
+        Show a progress value and status text.
+
+        Args:
+            fraction: Progress value between 0.0 and 1.0
+            text: Status text (optional)
+        """
+        if self._closed:
+            return
+
         # Ensure fraction is in valid range
         fraction = max(0.0, min(1.0, fraction))
+
+        # Nothing visible changes below the 0.1% shown in the text
+        drawn = (int(fraction * 1000), text)
+        if drawn == self._last_drawn:
+            return
+        self._last_drawn = drawn
+
         self.progress_bar.set_fraction(fraction)
 
         if text:
@@ -162,41 +282,72 @@ class ProgressDialog:
             else:
                 display_text = text
 
-            self.progress_bar.set_text(display_text)
-            self.status_label.set_text(display_text)
+            if display_text != self._last_status_text:
+                self._last_status_text = display_text
+                self.status_label.set_text(display_text)
         else:
             # Just show percentage
             percentage = fraction * 100
-            self.progress_bar.set_text(f"Progress: {percentage:.1f}%")
+            display_text = f"Progress: {percentage:.1f}%"
+
+        if display_text != self._last_progress_text:
+            self._last_progress_text = display_text
+            self.progress_bar.set_text(display_text)
 
     def append_terminal_text(self, text):
         """
         Add text to the terminal output.
 
+        Text is queued and written to the buffer in batches, so this can be
+        called for every output line (and from worker threads).
+
         Args:
             text: Text to append to terminal
         """
-        if not text:
+        if not text or self._closed:
             return
 
         # Add newline if needed
         if not text.endswith("\n"):
             text += "\n"
 
+        with self._output_lock:
+            self._pending_output.append(text)
+            if self._output_source is None:
+                self._output_source = GLib.timeout_add(
+                    self.OUTPUT_FLUSH_MS, self._flush_terminal
+                )
+
+    def _flush_terminal(self):
+        """Write all queued output to the terminal buffer at once."""
+        with self._output_lock:
+            text = "".join(self._pending_output)
+            self._pending_output.clear()
+            self._output_source = None
+
+        if self._closed:
+            return False
+
         # Add text to buffer
         end_iter = self.terminal_buffer.get_end_iter()
         self.terminal_buffer.insert(end_iter, text)
 
+        # Drop the oldest output once the buffer grows past its limit
+        excess = self.terminal_buffer.get_char_count() - self.MAX_TERMINAL_CHARS
+        if excess > 0:
+            cut_iter = self.terminal_buffer.get_iter_at_offset(excess)
+            # Cut at a line boundary so no partial line is left at the top
+            cut_iter.forward_line()
+            self.terminal_buffer.delete(self.terminal_buffer.get_start_iter(), cut_iter)
+
         # Auto-scroll
         self._scroll_terminal_to_bottom()
+        return False  # Don't call again
 
     def _scroll_terminal_to_bottom(self):
         """Scroll terminal view to the bottom."""
-        vadj = self.terminal_view.get_vadjustment()
-        if vadj:
-            GLib.idle_add(
-                lambda: vadj.set_value(vadj.get_upper() - vadj.get_page_size())
-            )
+        # GTK performs the scroll after the new text has been laid out
+        self.terminal_view.scroll_mark_onscreen(self._end_mark)
 
     def _on_cancel_clicked(self, button):
         """Handle cancel button click."""
@@ -211,6 +362,9 @@ class ProgressDialog:
         Args:
             success: Whether the operation was successful
         """
+        # Don't let a late progress update overwrite the final state
+        self._progress.cancel()
+
         if success:
             self.progress_bar.set_fraction(1.0)
             self.progress_bar.set_text("Operation complete!")
@@ -244,4 +398,14 @@ class ProgressDialog:
 
     def destroy(self):
         """Close and destroy the dialog."""
+        self._closed = True
+
+        # Cancel pending redraws so they never run on destroyed widgets
+        self._progress.cancel()
+        with self._output_lock:
+            if self._output_source is not None:
+                GLib.source_remove(self._output_source)
+                self._output_source = None
+            self._pending_output.clear()
+
         self.window.destroy()
@@ -10,18 +10,121 @@ to install and manage different kernel versions.
 
 import threading
 import gi
+from concurrent.futures import ThreadPoolExecutor
 
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 from gi.repository import Gtk, Adw, GLib, Gio, GObject
 
-from core.kernel_manager import KernelManager
+from core.kernel_manager import KernelManager, natural_key
 from ui.dialogs.progress_dialog import ProgressDialog
 
+# Single long-lived worker for kernel list loads; one load runs at a time
+_LOAD_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="kernel-load")
+
+# Cells that only mirror model properties are built and bound by GTK from
+# these templates, with no Python callback per row
+
+# Version column: plain label bound to KernelModel:version
+_VERSION_CELL_UI = b"""
+<interface>
+  <template class="GtkListItem">
+    <property name="child">
+      <object class="GtkLabel">
+        <property name="xalign">0</property>
+        <property name="margin-start">12</property>
+        <property name="margin-end">12</property>
+        <binding name="label">
+          <lookup name="version" type="KernelModel">
+            <lookup name="item">GtkListItem</lookup>
+          </lookup>
+        </binding>
+      </object>
+    </property>
+  </template>
+</interface>
+"""
+
+# Type column: LTS/RT badges shown according to KernelModel:is_lts/is_rt
+_TYPE_CELL_UI = b"""
+<interface>
+  <template class="GtkListItem">
+    <property name="child">
+      <object class="GtkBox">
+        <property name="spacing">4</property>
+        <property name="margin-start">12</property>
+        <property name="margin-end">12</property>
+        <child>
+          <object class="GtkLabel">
+            <property name="label">LTS</property>
+            <style>
+              <class name="caption"/>
+              <class name="tag"/>
+              <class name="success"/>
+            </style>
+            <binding name="visible">
+              <lookup name="is_lts" type="KernelModel">
+                <lookup name="item">GtkListItem</lookup>
+              </lookup>
+            </binding>
+          </object>
+        </child>
+        <child>
+          <object class="GtkLabel">
+            <property name="label">RT</property>
+            <style>
+              <class name="caption"/>
+              <class name="tag"/>
+              <class name="accent"/>
+            </style>
+            <binding name="visible">
+              <lookup name="is_rt" type="KernelModel">
+                <lookup name="item">GtkListItem</lookup>
+              </lookup>
+            </binding>
+          </object>
+        </child>
+      </object>
+    </property>
+  </template>
+</interface>
+"""
+
+
+# Gtk.Ordering for a cmp() result of 0, 1 and -1
+_ORDERINGS = (Gtk.Ordering.EQUAL, Gtk.Ordering.LARGER, Gtk.Ordering.SMALLER)
+
+
+def _compare(a, b):
+    """Compare two values for a Gtk.CustomSorter."""
+    return _ORDERINGS[(a > b) - (a < b)]
+
+
+# Column sort functions; they read KernelModel's plain attributes so a
+# comparison costs one Python call and no GValue conversions
+
+
+def _compare_names(a, b, user_data=None):
+    """Sort function for the Package Name column (numbers compared as numbers)."""
+    return _compare(a._name_key, b._name_key)
+
+
+def _compare_versions(a, b, user_data=None):
+    """Sort function for the Version column (so 6.9 sorts before 6.10)."""
+    return _compare(a._version_key, b._version_key)
+
+
+def _compare_types(a, b, user_data=None):
+    """Sort function for the Type column (ascending: regular, RT, LTS)."""
+    return _compare((a._is_lts, a._is_rt), (b._is_lts, b._is_rt))
+
 
 class KernelModel(GObject.Object):
     """Model for kernel data in column view."""
 
+    # Fixed type name, referenced by the cell templates above
+    __gtype_name__ = "KernelModel"
+
     # Define GObject properties
     id = GObject.Property(type=str, default="")
     name = GObject.Property(type=str, default="Unknown")
@@ -35,29 +138,65 @@ class KernelModel(GObject.Object):
         super().__init__()
         self.original_data = kernel_dict
 
+        # Plain attribute copies for the bind callbacks and sort functions,
+        # which run per row and would otherwise go through GValue conversion;
+        # the GObject properties below are kept for the cell templates
+        self._name = kernel_dict.get("name", "Unknown")
+        self._version = kernel_dict.get("version", "Unknown")
+        self._is_lts = kernel_dict.get("lts", False)
+        self._is_rt = kernel_dict.get("rt", False)
+        self._installed = kernel_dict.get("installed", False)
+        self._running = kernel_dict.get("running", False)
+
+        # Natural sort keys, built once instead of on every comparison
+        self._name_key = natural_key(self._name)
+        self._version_key = natural_key(self._version)
+
         # Set properties from dictionary data
         self.set_property("id", kernel_dict.get("id", ""))
-        self.set_property("name", kernel_dict.get("name", "Unknown"))
-        self.set_property("version", kernel_dict.get("version", "Unknown"))
-        self.set_property(
-            "is_lts",
-            "-lts" in kernel_dict.get("name", "").lower()
-            or kernel_dict.get("lts", False),
-        )
-        self.set_property(
-            "is_rt",
-            "rt" in kernel_dict.get("name", "").lower() or kernel_dict.get("rt", False),
-        )
-        self.set_property("installed", kernel_dict.get("installed", False))
-        self.set_property("running", kernel_dict.get("running", False))
+        self.set_property("name", self._name)
+        self.set_property("version", self._version)
+        self.set_property("is_lts", self._is_lts)
+        self.set_property("is_rt", self._is_rt)
+        self.set_property("installed", self._installed)
+        self.set_property("running", self._running)
 
 
 class KernelPage(Gtk.Box):
     """Page for kernel management."""
 
-    def __init__(self):
-        """Initialize the kernel management page."""
+    # Action button look per kernel state: (label, sensitive, style class),
+    # indexed by running << 1 | installed
+    _AVAILABLE_STATE = ("Install", True, "suggested-action")
+    _INSTALLED_STATE = ("Remove", True, "destructive-action")
+    _RUNNING_STATE = ("In Use", False, "warning")
+    ACTION_STATES = (_AVAILABLE_STATE, _INSTALLED_STATE, _RUNNING_STATE, _RUNNING_STATE)
+
+    def __init__(self, package_manager=None):
+        """
+        Initialize the kernel management page.
+
+        Args:
+            package_manager: Shared PackageManager instance (optional).
+        """
         super().__init__(orientation=Gtk.Orientation.VERTICAL, spacing=0)
+        self.package_manager = package_manager
+
+        # Status pages and dialog created on demand
+        self.empty_state = None
+        self.error_state = None
+        self.progress_dialog = None
+
+        # Pending delayed kernel reload (GLib source ID)
+        self._load_source = None
+
+        # Reusable confirmation dialog and the operation it is confirming
+        self._confirm_dialog = None
+        self._pending_operation = None
+
+        # Toast overlay found in the widget tree (resolved on first use)
+        self._toast_overlay = None
+        self.connect("unrealize", self._on_unrealize)
 
         # Setup main UI components
         self._setup_ui()
@@ -71,17 +210,13 @@ class KernelPage(Gtk.Box):
 
     def _setup_ui(self):
         """Setup the main UI components."""
-        # Scroll container
-        self.scroll = Gtk.ScrolledWindow(
-            vexpand=True,
-            hscrollbar_policy=Gtk.PolicyType.NEVER,
-            vscrollbar_policy=Gtk.PolicyType.AUTOMATIC,
-        )
-
-        # Content box with width limit
+        # Content box with width limit; it is not wrapped in a scroller of
+        # its own: the kernel list scrolls itself (so the ColumnView only
+        # realizes visible rows) and the status pages scroll internally
         self.content = Gtk.Box(
             orientation=Gtk.Orientation.VERTICAL,
             spacing=12,
+            vexpand=True,
             margin_bottom=24,
             margin_start=12,
             margin_end=12,
@@ -91,11 +226,10 @@ class KernelPage(Gtk.Box):
         self.content.set_size_request(800, -1)  # Width: 800px, Height: natural
         self.content.set_halign(Gtk.Align.CENTER)  # Center the content box
 
-        self.scroll.set_child(self.content)
-        self.append(self.scroll)
+        self.append(self.content)
 
         # Initialize kernel manager
-        self.kernel_manager = KernelManager()
+        self.kernel_manager = KernelManager(package_manager=self.package_manager)
         self.loading_page = None
 
     def _create_column_view(self):
@@ -110,9 +244,9 @@ class KernelPage(Gtk.Box):
         # Set up store and models
         self.store = Gio.ListStore(item_type=KernelModel)
 
-        # Create sorter and connect it properly to enable column header sorting
-        self.sorter = Gtk.MultiSorter.new()
-        self.sort_model = Gtk.SortListModel.new(self.store, self.sorter)
+        # Sorted by the column view's own sorter (set below), which follows
+        # the column header clicks without any Python handler
+        self.sort_model = Gtk.SortListModel.new(self.store, None)
         self.selection = Gtk.SingleSelection.new(self.sort_model)
 
         # Create the column view with the proper sort mechanism
@@ -120,16 +254,18 @@ class KernelPage(Gtk.Box):
         self.column_view.add_css_class("card")
         self.column_view.set_show_row_separators(True)
         self.column_view.set_show_column_separators(True)
-
-        # Important: Connect the sorter to the column view so clicks work
-        self.column_view.set_model(self.selection)
         self.column_view.set_halign(Gtk.Align.CENTER)
 
         # Add the columns with a simplified approach
         self._add_columns()
+        self.sort_model.set_sorter(self.column_view.get_sorter())
 
-        # Add to scrolled window
-        scrolled_window = Gtk.ScrolledWindow(hexpand=True, vexpand=True)
+        # The ColumnView is the direct child of the page's only scroller
+        scrolled_window = Gtk.ScrolledWindow(
+            hexpand=True,
+            vexpand=True,
+            hscrollbar_policy=Gtk.PolicyType.NEVER,
+        )
         scrolled_window.set_child(self.column_view)
         self.kernel_list_box.append(scrolled_window)
 
@@ -138,101 +274,53 @@ class KernelPage(Gtk.Box):
 
     def _add_columns(self):
         """Add columns to the column view with appropriate sorters."""
-        # Create expression objects for properties
-        name_expr = Gtk.PropertyExpression.new(KernelModel.__gtype__, None, "name")
-        version_expr = Gtk.PropertyExpression.new(
-            KernelModel.__gtype__, None, "version"
-        )
-        lts_expr = Gtk.PropertyExpression.new(KernelModel.__gtype__, None, "is_lts")
-        rt_expr = Gtk.PropertyExpression.new(KernelModel.__gtype__, None, "is_rt")
-        installed_expr = Gtk.PropertyExpression.new(
-            KernelModel.__gtype__, None, "installed"
-        )
-        running_expr = Gtk.PropertyExpression.new(
-            KernelModel.__gtype__, None, "running"
+        # Add Name column (bound in Python: the running kernel is shown bold)
+        name_factory = Gtk.SignalListItemFactory.new()
+        name_factory.connect("setup", self._setup_text_cell)
+        name_factory.connect("bind", self._bind_name_cell)
+        self._add_text_column(
+            "Package Name", True, Gtk.CustomSorter.new(_compare_names), name_factory
         )
 
-        # Add Name column
-        self._add_text_column("Package Name", True, name_expr, self._bind_name_cell)
-
         # Add Version column
-        self._add_text_column("Version", False, version_expr, self._bind_version_cell)
+        version_factory = self._template_factory(_VERSION_CELL_UI)
+        self._add_text_column(
+            "Version", False, Gtk.CustomSorter.new(_compare_versions), version_factory
+        )
 
         # Add Type column
-        type_factory = Gtk.SignalListItemFactory.new()
-        type_factory.connect("setup", self._setup_type_cell)
-        type_factory.connect("bind", self._bind_type_cell)
-
-        type_sorter = Gtk.MultiSorter.new()
-        type_sorter.append(Gtk.NumericSorter.new(lts_expr))
-        type_sorter.append(Gtk.NumericSorter.new(rt_expr))
+        type_factory = self._template_factory(_TYPE_CELL_UI)
 
         type_column = Gtk.ColumnViewColumn.new("Type", type_factory)
         type_column.set_resizable(True)
-        type_column.set_sorter(type_sorter)
+        type_column.set_sorter(Gtk.CustomSorter.new(_compare_types))
         self.column_view.append_column(type_column)
 
         # Add Action column (not sortable)
         action_factory = Gtk.SignalListItemFactory.new()
         action_factory.connect("setup", self._setup_action_cell)
         action_factory.connect("bind", self._bind_action_cell)
+        action_factory.connect("unbind", self._unbind_action_cell)
         action_column = Gtk.ColumnViewColumn.new("Action", action_factory)
         action_column.set_resizable(True)
         self.column_view.append_column(action_column)
 
-    def _add_text_column(self, title, expand, expr, bind_func):
-        """Helper to add a text column with sorting."""
-        factory = Gtk.SignalListItemFactory.new()
-        factory.connect("setup", self._setup_text_cell)
-        factory.connect("bind", bind_func)
+    @staticmethod
+    def _template_factory(ui_xml):
+        """Create a list item factory that builds cells from a UI template."""
+        return Gtk.BuilderListItemFactory.new_from_bytes(None, GLib.Bytes.new(ui_xml))
 
+    def _add_text_column(self, title, expand, sorter, factory):
+        """Helper to add a text column with sorting."""
         column = Gtk.ColumnViewColumn.new(title, factory)
         column.set_resizable(True)
         if expand:
             column.set_expand(True)
-
-        # Create sorter based on property name (simplify the type check)
-        if isinstance(expr, Gtk.PropertyExpression):
-            # Just assume string sorter is appropriate for most cases
-            # This avoids the need for get_expression_type()
-            if title.lower() == "status":
-                # Special case for status column
-                sorter = Gtk.NumericSorter.new(expr)
-            else:
-                sorter = Gtk.StringSorter.new(expr)
-
-            column.set_sorter(sorter)
-
-        # Connect to sorter changed event
-        column.connect("notify::sorter-order", self._on_sort_changed)
+        column.set_sorter(sorter)
 
         self.column_view.append_column(column)
         return column
 
-    def _on_sort_changed(self, column, pspec):
-        """Handle column header click for sorting."""
-        # Get all columns
-        columns = self.column_view.get_columns()
-
-        # Find which column was clicked
-        for i, col in enumerate(columns):
-            if col == column:
-                # Get sort order
-                order = column.get_sorter_order()
-
-                # Clear existing sorters
-                self.sorter.remove_all()
-
-                # Add new sorter if actively sorting
-                if order != Gtk.SorterOrder.NONE:
-                    sorter = column.get_sorter()
-                    if sorter:
-                        self.sorter.append(sorter)
-
-                # Log for debugging
-                print(f"Column {i} ({column.get_title()}) clicked, order: {order}")
-                break
-
     def _setup_text_cell(self, factory, list_item):
         """Setup a basic text cell."""
         label = Gtk.Label(xalign=0, margin_start=12, margin_end=12)
@@ -242,43 +330,12 @@ class KernelPage(Gtk.Box):
         """Bind the kernel name cell."""
         kernel = list_item.get_item()
         label = list_item.get_child()
-        label.set_text(kernel.get_property("name"))
-        if kernel.get_property("running"):
+        label.set_text(kernel._name)
+        if kernel._running:
             label.add_css_class("bold")
         else:
             label.remove_css_class("bold")
 
-    def _bind_version_cell(self, factory, list_item):
-        """Bind the version cell."""
-        kernel = list_item.get_item()
-        label = list_item.get_child()
-        label.set_text(kernel.get_property("version"))
-
-    def _setup_type_cell(self, factory, list_item):
-        """Setup the type cell for LTS/RT badges."""
-        box = Gtk.Box(
-            orientation=Gtk.Orientation.HORIZONTAL,
-            spacing=4,
-            margin_start=12,
-            margin_end=12,
-        )
-        list_item.set_child(box)
-
-    def _bind_type_cell(self, factory, list_item):
-        """Bind the type cell with LTS/RT badges."""
-        kernel = list_item.get_item()
-        box = list_item.get_child()
-
-        # Clear previous children
-        while box.get_first_child():
-            box.remove(box.get_first_child())
-
-        if kernel.get_property("is_lts"):
-            box.append(self._create_badge("LTS", "success"))
-
-        if kernel.get_property("is_rt"):
-            box.append(self._create_badge("RT", "accent"))
-
     def _setup_action_cell(self, factory, list_item):
         """Setup the action button cell."""
         button = Gtk.Button(margin_start=12, margin_end=12)
@@ -290,6 +347,11 @@ class KernelPage(Gtk.Box):
             button_content.set_margin_top(2)
             button_content.set_margin_bottom(2)
 
+        # One handler per recycled cell; it acts on whichever kernel is bound
+        button.kernel = None
+        button.state = None
+        button.connect("clicked", self._on_action_clicked)
+
         box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL)
         box.append(button)
         list_item.set_child(box)
@@ -301,51 +363,25 @@ class KernelPage(Gtk.Box):
         button = box.get_first_child()
         button.kernel = kernel
 
-        # Disconnect any existing signals
-        for handler_id in getattr(button, "handler_ids", []):
-            if button.handler_is_connected(handler_id):
-                button.disconnect(handler_id)
-        button.handler_ids = []
-
         # Setup button based on kernel status
-        if kernel.get_property("running"):
-            self._setup_running_button(button)
-        elif kernel.get_property("installed"):
-            self._setup_installed_button(button)
-        else:
-            self._setup_not_installed_button(button)
+        state = self.ACTION_STATES[bool(kernel._running) << 1 | bool(kernel._installed)]
+        label, sensitive, style_class = state
 
-    def _setup_running_button(self, button):
-        """Setup button for running kernel."""
-        button.set_label("In Use")
-        button.set_sensitive(False)
-        button.add_css_class("warning")
-        button.remove_css_class("destructive-action")
-        button.remove_css_class("suggested-action")
-
-    def _setup_installed_button(self, button):
-        """Setup button for installed (but not running) kernel."""
-        button.set_label("Remove")
-        button.set_sensitive(True)
-        button.add_css_class("destructive-action")
-        button.remove_css_class("warning")
-        button.remove_css_class("suggested-action")
+        # Sensitivity is always reset: an operation may have disabled the button
+        button.set_sensitive(sensitive)
 
-        # Connect remove handler
-        handler_id = button.connect("clicked", self._on_remove_clicked)
-        button.handler_ids = [handler_id]
+        # Label and style only change when the recycled cell changes state
+        if button.state is not state:
+            if button.state is not None:
+                button.remove_css_class(button.state[2])
+            button.add_css_class(style_class)
+            button.set_label(label)
+            button.state = state
 
-    def _setup_not_installed_button(self, button):
-        """Setup button for not installed kernel."""
-        button.set_label("Install")
-        button.set_sensitive(True)
-        button.add_css_class("suggested-action")
-        button.remove_css_class("destructive-action")
-        button.remove_css_class("warning")
-
-        # Connect install handler
-        handler_id = button.connect("clicked", self._on_install_clicked)
-        button.handler_ids = [handler_id]
+    def _unbind_action_cell(self, factory, list_item):
+        """Release the action button before its row widget is recycled."""
+        button = list_item.get_child().get_first_child()
+        button.kernel = None
 
     def _show_loading_ui(self):
         """Show loading UI and hide kernel list."""
@@ -379,40 +415,70 @@ class KernelPage(Gtk.Box):
 
     def _load_kernels(self):
         """Load kernel information."""
-        threading.Thread(target=self._background_load_kernels, daemon=True).start()
+        _LOAD_POOL.submit(self._background_load_kernels)
         return False
 
     def _background_load_kernels(self):
         """Load kernels in background thread."""
         try:
             kernels = self.kernel_manager.get_available_kernels()
-            GLib.idle_add(self._display_kernels, kernels)
+            # Build the row models here too; the main thread only splices them
+            models = [KernelModel(kernel) for kernel in kernels]
+            GLib.idle_add(self._display_kernels, models)
         except Exception as e:
             GLib.idle_add(self._show_error, str(e))
 
-    def _display_kernels(self, kernels):
+    def _display_kernels(self, models):
         """Display the kernel list in the UI."""
-        # Hide loading UI and clear current model
-        self._hide_loading_ui()
-        self.store.remove_all()
-
-        if not kernels:
+        if not models:
+            self._hide_loading_ui()
+            self.store.remove_all()
             self._show_empty_state()
             return False
 
-        # Add kernels directly to store - no need for sorting as it will be handled by GTK
-        for kernel in kernels:
-            self.store.append(KernelModel(kernel))
+        # Update the model while the list is still hidden behind the
+        # loading page, so the view lays out once when it is shown
+        self._update_store(models)
+        self._hide_loading_ui()
 
         return False
 
+    def _update_store(self, models):
+        """Bring the kernel store in line with a freshly loaded kernel list."""
+        # First load: fill the store with a single items-changed emission
+        if self.store.get_n_items() == 0:
+            self.store.splice(0, 0, models)
+            return
+
+        new_keys = [self._kernel_key(model.original_data) for model in models]
+        old_keys = [
+            self._kernel_key(self.store.get_item(position).original_data)
+            for position in range(self.store.get_n_items())
+        ]
+
+        # Kernels were added or removed: replace the store in one splice so
+        # the list keeps the loader's order
+        if new_keys != old_keys:
+            self.store.splice(0, self.store.get_n_items(), models)
+            return
+
+        # Same kernels: update in place so only changed rows are re-bound
+        for position, model in enumerate(models):
+            if model.original_data != self.store.get_item(position).original_data:
+                self.store.splice(position, 1, [model])
+
+    @staticmethod
+    def _kernel_key(kernel):
+        """Return the key identifying a kernel entry across refreshes."""
+        return (kernel.get("name"), kernel.get("version"))
+
     def _show_empty_state(self):
         """Show message when no kernels are available."""
         # Hide kernel list
         self.kernel_list_box.set_visible(False)
 
         # Create empty state if it doesn't exist
-        if not hasattr(self, "empty_state"):
+        if self.empty_state is None:
             self.empty_state = Adw.StatusPage(
                 icon_name="dialog-warning-symbolic",
                 title="No Kernel Versions Available",
@@ -434,7 +500,7 @@ class KernelPage(Gtk.Box):
         self.kernel_list_box.set_visible(False)
 
         # Create or update error state
-        if not hasattr(self, "error_state"):
+        if self.error_state is None:
             self.error_state = Adw.StatusPage(
                 icon_name="dialog-error-symbolic",
                 title="Error Loading Kernels",
@@ -456,22 +522,36 @@ class KernelPage(Gtk.Box):
     def _refresh_kernels(self):
         """Refresh kernel list."""
         # Hide any status pages
-        if hasattr(self, "empty_state") and self.empty_state in self.content:
+        if self.empty_state is not None and self.empty_state in self.content:
             self.content.remove(self.empty_state)
 
-        if hasattr(self, "error_state") and self.error_state in self.content:
+        if self.error_state is not None and self.error_state in self.content:
             self.content.remove(self.error_state)
 
         self._show_loading_ui()
-        GLib.timeout_add(100, self._load_kernels)
+        self._schedule_load_kernels()
+
+    def _schedule_load_kernels(self, delay=100):
+        """Schedule a kernel reload, merging requests made in quick succession."""
+        if self._load_source is not None:
+            GLib.source_remove(self._load_source)
+        self._load_source = GLib.timeout_add(delay, self._on_load_timeout)
 
-    def _create_badge(self, text, style_class):
-        """Create a styled badge widget."""
-        badge = Gtk.Label(label=text)
-        badge.add_css_class("caption")
-        badge.add_css_class("tag")
-        badge.add_css_class(style_class)
-        return badge
+    def _on_load_timeout(self):
+        """Run the scheduled kernel reload."""
+        self._load_source = None
+        return self._load_kernels()
+
+    def _on_action_clicked(self, button):
+        """Handle a click on a row's action button (connected once per cell)."""
+        kernel = button.kernel
+        if kernel is None or kernel._running:
+            return
+
+        if kernel._installed:
+            self._on_remove_clicked(button)
+        else:
+            self._on_install_clicked(button)
 
     def _on_install_clicked(self, button):
         """Handle install button click."""
@@ -479,7 +559,7 @@ class KernelPage(Gtk.Box):
         self._show_confirmation_dialog(
             title="Install Kernel",
             message=(
-                f"Are you sure you want to install the {kernel.get_property('name')} kernel?\n\n"
+                f"Are you sure you want to install the {kernel._name} kernel?\n\n"
                 "This will install the kernel and its modules.\n"
                 "This operation requires sudo privileges."
             ),
@@ -494,7 +574,7 @@ class KernelPage(Gtk.Box):
         self._show_confirmation_dialog(
             title="Remove Kernel",
             message=(
-                f"Are you sure you want to remove the {kernel.get_property('name')} kernel?\n\n"
+                f"Are you sure you want to remove the {kernel._name} kernel?\n\n"
                 "This will remove the kernel and its modules.\n"
                 "This operation requires sudo privileges."
             ),
@@ -508,42 +588,58 @@ class KernelPage(Gtk.Box):
         self, title, message, action, kernel, button, destructive=False
     ):
         """Show confirmation dialog for kernel operations."""
-        dialog = Adw.MessageDialog.new(self.get_root())
+        dialog = self._get_confirm_dialog()
+        dialog.set_transient_for(self.get_root())
         dialog.set_heading(title)
         dialog.set_body(message)
 
-        dialog.add_response("cancel", "Cancel")
-        dialog.add_response(action, "Yes, " + action.title())
-
+        dialog.set_response_label("confirm", "Yes, " + action.title())
         dialog.set_response_appearance(
-            action,
+            "confirm",
             Adw.ResponseAppearance.DESTRUCTIVE
             if destructive
             else Adw.ResponseAppearance.SUGGESTED,
         )
-        dialog.set_default_response("cancel")
-        dialog.set_close_response("cancel")
 
-        # Connect response handler
-        dialog.connect(
-            "response",
-            lambda d, r: self._on_dialog_response(d, r, action, kernel, button),
-        )
+        # Remember what the dialog is confirming
+        self._pending_operation = (action, kernel, button)
 
         dialog.present()
 
-    def _on_dialog_response(self, dialog, response, action, kernel, button):
+    def _get_confirm_dialog(self):
+        """Return the confirmation dialog, creating it on first use."""
+        if self._confirm_dialog is None:
+            dialog = Adw.MessageDialog.new(self.get_root())
+            dialog.add_response("cancel", "Cancel")
+            dialog.add_response("confirm", "Yes")
+            dialog.set_default_response("cancel")
+            dialog.set_close_response("cancel")
+            dialog.set_hide_on_close(True)
+
+            # Connect response handler
+            dialog.connect("response", self._on_dialog_response)
+            self._confirm_dialog = dialog
+
+        return self._confirm_dialog
+
+    def _on_dialog_response(self, dialog, response):
         """Handle dialog response for both install and remove actions."""
-        if response != action:
+        pending, self._pending_operation = self._pending_operation, None
+        if response != "confirm" or pending is None:
             return
 
+        action, kernel, button = pending
+
+        # Set by the Cancel button to stop pacman
+        cancel_event = threading.Event()
+
         # Setup progress dialog
         progress_dialog = ProgressDialog(
             parent_window=self.get_root(),
             title=f"{action.title()}ing {kernel['name']} Kernel",
             operation_type=action,
             target_name=kernel["name"],
-            cancel_callback=lambda: self._on_operation_canceled(kernel),
+            cancel_callback=lambda: self._on_operation_canceled(kernel, cancel_event),
         )
 
         # Store reference and show dialog
@@ -571,13 +667,15 @@ class KernelPage(Gtk.Box):
             complete_callback=lambda success: GLib.idle_add(
                 self._operation_complete, button, kernel, action, success
             ),
+            cancel_event=cancel_event,
         )
 
-    def _on_operation_canceled(self, kernel):
+    def _on_operation_canceled(self, kernel, cancel_event):
         """Handle cancel button click during operation."""
-        if hasattr(self, "progress_dialog"):
-            delattr(self, "progress_dialog")
-        self._load_kernels()
+        # The worker thread stops pacman and reports completion as usual
+        cancel_event.set()
+        self.progress_dialog = None
+        self._schedule_load_kernels()
 
     def _operation_complete(self, button, kernel, operation, success):
         """Handle operation completion."""
@@ -585,7 +683,7 @@ class KernelPage(Gtk.Box):
         button.set_sensitive(True)
 
         # Update progress dialog
-        if hasattr(self, "progress_dialog") and self.progress_dialog:
+        if self.progress_dialog is not None:
             self.progress_dialog.set_complete(success)
 
         # Show toast notification
@@ -613,8 +711,23 @@ class KernelPage(Gtk.Box):
                 toast.set_priority(Adw.ToastPriority.HIGH)
             overlay.add_toast(toast)
 
+    def _on_unrealize(self, widget):
+        """Drop references that depend on the current widget hierarchy."""
+        self._toast_overlay = None
+
+        # Cancel a pending reload so it never runs on a torn-down page
+        if self._load_source is not None:
+            GLib.source_remove(self._load_source)
+            self._load_source = None
+
     def _find_toast_overlay(self):
-        """Find the nearest ToastOverlay in the widget hierarchy."""
+        """Find the nearest ToastOverlay in the widget hierarchy (cached)."""
+        if self._toast_overlay is None:
+            self._toast_overlay = self._lookup_toast_overlay()
+        return self._toast_overlay
+
+    def _lookup_toast_overlay(self):
+        """Walk the widget hierarchy looking for a ToastOverlay."""
         widget = self
         while widget:
             if isinstance(widget, Adw.ToastOverlay):
@@ -16,13 +16,50 @@ gi.require_version("Adw", "1")
 from gi.repository import Gtk, Adw, GLib
 
 from core.mesa_manager import MesaManager
+from ui.dialogs.progress_dialog import ProgressThrottler
+
+# Row icon per driver, picked by the first keyword found in the driver ID
+_ICON_RULES = (
+    ("git", "weather-storm-symbolic"),  # More cutting-edge
+    ("amber", "emblem-default-symbolic"),  # More stable
+)
+_DEFAULT_ICON = "video-display-symbolic"
+
+# Dialog texts
+_HELP_BODY = (
+    "Different driver versions offer various features and performance characteristics:\n\n"
+    "• Amber: Stable and well-tested version\n"
+    "• Stable: Regular Mesa release\n"
+    "• Tkg-Stable: Enhanced performance build\n"
+    "• Tkg-git: Latest development version with cutting-edge features\n\n"
+    "Choose the one that best fits your needs and hardware."
+)
+_CONFIRM_BODY = (
+    "Are you sure you want to apply the selected driver changes?\n\n"
+    "This will modify your system's video drivers and might require a reboot."
+)
+_SUCCESS_BODY = (
+    "The video driver was changed successfully.\n"
+    "You may need to reboot your system for changes to take effect."
+)
+_FAILURE_BODY = (
+    "The driver change operation failed. Please check the system logs for details."
+)
 
 
 class MesaPage(Gtk.Box):
     """Page for Mesa drivers management."""
 
-    def __init__(self):
-        """Initialize the Mesa drivers management page."""
+    # Minimum interval between progress bar redraws (milliseconds, ~30 Hz)
+    PROGRESS_UPDATE_MS = 33
+
+    def __init__(self, package_manager=None):
+        """
+        Initialize the Mesa drivers management page.
+
+        Args:
+            package_manager: Shared PackageManager instance (optional).
+        """
         super().__init__(orientation=Gtk.Orientation.VERTICAL, spacing=12)
         self.set_margin_top(24)
         self.set_margin_bottom(24)
@@ -30,7 +67,20 @@ class MesaPage(Gtk.Box):
         self.set_margin_end(24)
 
         # Initialize Mesa manager
-        self.mesa_manager = MesaManager()
+        self.mesa_manager = MesaManager(package_manager=package_manager)
+
+        # Progress updates from the apply thread, drawn at most ~30 times/s
+        self._progress = ProgressThrottler(self._draw_progress, self.PROGRESS_UPDATE_MS)
+
+        # Pending delayed hide of the progress container (GLib source ID)
+        self._hide_source = None
+        self.connect("unrealize", self._on_unrealize)
+
+        # Dialogs, created on first use and reused
+        self._help_dialog = None
+        self._confirm_dialog = None
+        self._completion_dialog = None
+        self._pending_driver = None
 
         # Set up initial loading view
         self._setup_loading_view()
@@ -87,11 +137,9 @@ class MesaPage(Gtk.Box):
 
         # Add temporary spinner to the list
         self.driver_box.append(temp_spinner)
+        self._temp_spinner = temp_spinner
 
-        # Schedule actual driver loading in a separate thread using Python's threading module
-        threading_thread = threading.Thread(target=self._background_load_drivers)
-        threading_thread.daemon = True
-        threading_thread.start()
+        self._load_mesa_drivers()
 
         return False  # Don't call again
 
@@ -107,91 +155,114 @@ class MesaPage(Gtk.Box):
 
     def _finish_driver_loading(self, drivers):
         """Finish driver loading in the main thread."""
-        # Clear existing items including temporary spinner
-        while True:
-            child = self.driver_box.get_first_child()
-            if child is None:
-                break
-            self.driver_box.remove(child)
+        # Remove the temporary spinner
+        if self._temp_spinner is not None:
+            self.driver_box.remove(self._temp_spinner)
+            self._temp_spinner = None
 
-        # Create first radio button (will be the group leader)
-        first_button = None
+        self._update_driver_rows(drivers)
 
-        # Add drivers to the list using a more modern approach with ActionRows
-        for driver in drivers:
-            # Create a row for better visual presentation
-            row = Adw.ActionRow()
-            row.set_title(driver["name"])
+        # Enable the apply button after loading
+        self.apply_button.set_sensitive(True)
 
-            if "description" in driver:
-                row.set_subtitle(driver["description"])
+        return False  # Don't call again
 
-            # Add icon based on driver type
-            icon_name = "video-display-symbolic"
-            if "git" in driver["id"]:
-                icon_name = "weather-storm-symbolic"  # More cutting-edge
-            elif "amber" in driver["id"]:
-                icon_name = "emblem-default-symbolic"  # More stable
+    def _update_driver_rows(self, drivers):
+        """
+        Show the given driver list, creating the rows on first use.
 
-            icon = Gtk.Image.new_from_icon_name(icon_name)
-            row.add_prefix(icon)
+        The set of drivers is fixed, so later refreshes only update which
+        driver is marked active.
 
-            # Create radio button and add to row
-            button = Gtk.CheckButton()
+        Args:
+            drivers: Drivers as returned by MesaManager.get_available_drivers().
+        """
+        if not self.driver_buttons:
+            # Create first radio button (will be the group leader)
+            first_button = None
+            for driver in drivers:
+                row, button = self._create_driver_row(driver, first_button)
+                if first_button is None:
+                    first_button = button
+                self.driver_box.append(row)
+
+        # Mark the active driver
+        for driver in drivers:
+            if driver.get("active", False):
+                self._set_active_driver(driver["id"])
+                break
 
-            # Set up the button group
-            if first_button is None:
-                first_button = button
-            else:
-                button.set_group(first_button)
+    def _set_active_driver(self, driver_id):
+        """
+        Mark a driver as the active one without re-querying pacman.
+
+        Args:
+            driver_id: ID of the driver to mark as active.
+        """
+        for other_id, active_tag in self.driver_active_tags.items():
+            active_tag.set_visible(other_id == driver_id)
+        self.driver_buttons[driver_id].set_active(True)
 
-            # Store the button
-            self.driver_buttons[driver["id"]] = button
+    def _create_driver_row(self, driver, group_leader):
+        """
+        Create the row for one driver.
 
-            # Mark the active driver
-            if driver.get("active", False):
-                button.set_active(True)
+        Args:
+            driver: Driver information.
+            group_leader: Check button whose group the new button joins, or None.
+
+        Returns:
+            tuple: The Adw.ActionRow and its Gtk.CheckButton.
+        """
+        # Create a row for better visual presentation
+        row = Adw.ActionRow()
+        row.set_title(driver["name"])
+
+        if "description" in driver:
+            row.set_subtitle(driver["description"])
+
+        # Add icon based on driver type
+        driver_id = driver["id"]
+        icon_name = next(
+            (icon for keyword, icon in _ICON_RULES if keyword in driver_id),
+            _DEFAULT_ICON,
+        )
 
-                # Add "Active" tag using a styled label instead of Pill
-                active_tag = Gtk.Label.new("Active")
-                active_tag.add_css_class("success")
-                active_tag.add_css_class("caption")
-                active_tag.set_margin_start(4)
-                active_tag.set_margin_end(4)
+        icon = Gtk.Image.new_from_icon_name(icon_name)
+        row.add_prefix(icon)
 
-                active_box = Gtk.Box()
-                active_box.add_css_class("card")
-                active_box.add_css_class("success")
-                active_box.set_margin_start(4)
-                active_box.set_margin_end(8)
-                active_box.append(active_tag)
+        # Create radio button and add to row
+        button = Gtk.CheckButton()
+        if group_leader is not None:
+            button.set_group(group_leader)
+        button.connect("toggled", self._on_driver_toggled, driver["id"])
 
-                row.add_suffix(active_box)
+        # Add "Active" tag using a styled label instead of Pill (shown when active)
+        active_tag = Gtk.Label(
+            label="Active",
+            css_classes=["card", "success", "caption", "active-tag"],
+        )
+        active_tag.set_margin_start(4)
+        active_tag.set_margin_end(8)
+        active_tag.set_visible(False)
+        row.add_suffix(active_tag)
 
-            row.add_prefix(button)
-            self.driver_box.append(row)
+        # Store the button and tag
+        self.driver_buttons[driver["id"]] = button
+        self.driver_active_tags[driver["id"]] = active_tag
 
-        # Enable the apply button after loading
-        self.apply_button.set_sensitive(True)
+        row.add_prefix(button)
+        return row, button
 
-        return False  # Don't call again
+    def _on_driver_toggled(self, button, driver_id):
+        """Remember which driver is selected in the radio group."""
+        if button.get_active():
+            self._selected_driver = driver_id
 
     def _create_content(self):
-        """Create the UI elements for Mesa drivers management with fixed layout."""
-        # Create main container as scrolled window to maintain fixed window size
-        main_scrolled = Gtk.ScrolledWindow()
-        main_scrolled.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
-        main_scrolled.set_min_content_height(550)  # Adjust to match your window height
-        main_scrolled.set_vexpand(True)
-
-        # Main content box inside scrolled window
-        main_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=16)
-        main_box.set_margin_top(24)
-        main_box.set_margin_bottom(24)
-        main_box.set_margin_start(24)
-        main_box.set_margin_end(24)
-
-        # Create a ClampView to constrain content width for better readability
+        """Create the UI elements for Mesa drivers management."""
+        # Constrain content width for better readability; the page itself
+        # provides the margins
         clamp = Adw.Clamp()
         clamp.set_maximum_size(800)
         clamp.set_tightening_threshold(600)
@@ -211,14 +282,7 @@ class MesaPage(Gtk.Box):
         info_button.connect("clicked", self._on_help_clicked)
         driver_group.set_header_suffix(info_button)
 
-        # Create a scrolled window for drivers that will resize itself
-        self.drivers_scrolled = Gtk.ScrolledWindow()
-        self.drivers_scrolled.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
-        self.drivers_scrolled.set_vexpand(True)
-        # Important: Start with a larger height, will shrink when progress appears
-        self.drivers_scrolled.set_min_content_height(300)
-
-        # Create a card for the driver options inside the scrolled window
+        # Create a card for the driver options
         driver_card = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
         driver_card.add_css_class("card")
         driver_card.set_margin_top(12)
@@ -230,9 +294,12 @@ class MesaPage(Gtk.Box):
         # Create checkbuttons for the driver options
         self.driver_group = None
         self.driver_buttons = {}
+        self.driver_active_tags = {}
+        self._temp_spinner = None
+        self._applying_driver = None
+        self._selected_driver = None
 
-        self.drivers_scrolled.set_child(driver_card)
-        driver_group.add(self.drivers_scrolled)
+        driver_group.add(driver_card)
         self.driver_box = driver_card
         driver_group.set_vexpand(False)
 
@@ -252,7 +319,23 @@ class MesaPage(Gtk.Box):
 
         content_box.append(button_box)
 
-        # Progress section (initially hidden)
+        # Progress section is built on first use
+        self.content_box = content_box
+        self.progress_container = None
+        self.progress_label = None
+        self.progress_bar = None
+
+        # Set the clamp's child to the content box
+        clamp.set_child(content_box)
+
+        # Add the clamp to this widget
+        self.append(clamp)
+
+        # Disable apply button initially until drivers are loaded
+        self.apply_button.set_sensitive(False)
+
+    def _build_progress_container(self):
+        """Create the progress section (initially hidden)."""
         progress_card = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
         progress_card.add_css_class("card")
         progress_card.set_margin_top(16)
@@ -271,170 +354,92 @@ class MesaPage(Gtk.Box):
         self.progress_bar.set_margin_bottom(16)
         progress_card.append(self.progress_bar)
 
-        content_box.append(progress_card)
+        self.content_box.append(progress_card)
 
         # Progress card is initially hidden
         progress_card.set_visible(False)
         self.progress_container = progress_card
 
-        # Set the clamp's child to the content box
-        clamp.set_child(content_box)
-        main_box.append(clamp)
-
-        # Set the main box as the child of the scrolled window
-        main_scrolled.set_child(main_box)
-
-        # Add the main scrolled window to this widget
-        self.append(main_scrolled)
-
-        # Disable apply button initially until drivers are loaded
-        self.apply_button.set_sensitive(False)
-
     def _show_progress_container(self):
-        """Show the progress container and adjust layout."""
-        if not self.progress_container.get_visible():
-            self.progress_container.set_visible(True)
-            # Reduce the driver list size when progress container appears
-            self.drivers_scrolled.set_min_content_height(350)
+        """Show the progress container."""
+        if self.progress_container is None:
+            self._build_progress_container()
+
+        self.progress_container.set_visible(True)
 
     def _hide_progress_container(self):
-        """Hide the progress container and restore layout."""
-        # Delay hiding to let animations complete
-        GLib.timeout_add(100, self._actually_hide_progress_container)
+        """Hide the progress container."""
+        # Hide once the dialog has finished closing
+        if self._hide_source is None:
+            self._hide_source = GLib.idle_add(
+                self._actually_hide_progress_container,
+                priority=GLib.PRIORITY_LOW,
+            )
         return False
 
     def _actually_hide_progress_container(self):
         """Actually hide the progress container."""
+        self._hide_source = None
         self.progress_container.set_visible(False)
-        # Restore the driver list to full size
-        self.drivers_scrolled.set_min_content_height(450)
         return False
 
     def _load_mesa_drivers(self):
-        """Load available Mesa drivers from the Mesa manager."""
-        # Clear existing items
-        while True:
-            child = self.driver_box.get_first_child()
-            if child is None:
-                break
-            self.driver_box.remove(child)
-
-        # Get available drivers
-        drivers = self.mesa_manager.get_available_drivers()
-
-        # Create first radio button (will be the group leader)
-        first_button = None
-
-        # Add drivers to the list using a more modern approach with ActionRows
-        for driver in drivers:
-            # Create a row for better visual presentation
-            row = Adw.ActionRow()
-            row.set_title(driver["name"])
-
-            if "description" in driver:
-                row.set_subtitle(driver["description"])
-
-            # Add icon based on driver type
-            icon_name = "video-display-symbolic"
-            if "git" in driver["id"]:
-                icon_name = "weather-storm-symbolic"  # More cutting-edge
-            elif "amber" in driver["id"]:
-                icon_name = "emblem-default-symbolic"  # More stable
-
-            icon = Gtk.Image.new_from_icon_name(icon_name)
-            row.add_prefix(icon)
-
-            # Create radio button and add to row
-            button = Gtk.CheckButton()
-
-            # Set up the button group
-            if first_button is None:
-                first_button = button
-            else:
-                button.set_group(first_button)
-
-            # Store the button
-            self.driver_buttons[driver["id"]] = button
-
-            # Mark the active driver
-            if driver.get("active", False):
-                button.set_active(True)
-
-                # Add "Active" tag using a styled label instead of Pill
-                active_tag = Gtk.Label.new("Active")
-                active_tag.add_css_class("success")
-                active_tag.add_css_class("caption")
-                active_tag.set_margin_start(4)
-                active_tag.set_margin_end(4)
-
-                active_box = Gtk.Box()
-                active_box.add_css_class("card")
-                active_box.add_css_class("success")
-                active_box.set_margin_start(4)
-                active_box.set_margin_end(8)
-                active_box.append(active_tag)
-
-                row.add_suffix(active_box)
-
-            row.add_prefix(button)
-            self.driver_box.append(row)
-
-    def _on_refresh_clicked(self, button):
-        """Callback for refresh button click."""
-        self._load_mesa_drivers()
+        """Load available Mesa drivers from the Mesa manager without blocking the UI."""
+        # Query pacman in a separate thread; the rows are updated on the main loop
+        threading_thread = threading.Thread(target=self._background_load_drivers)
+        threading_thread.daemon = True
+        threading_thread.start()
 
     def _on_help_clicked(self, button):
         """Show information dialog about the drivers."""
-        # Compatible with older libadwaita
-        dialog = Adw.MessageDialog.new(self.get_root())
-        dialog.set_heading("Video Drivers Information")
-        dialog.set_body(
-            "Different driver versions offer various features and performance characteristics:\n\n"
-            "• Amber: Stable and well-tested version\n"
-            "• Stable: Regular Mesa release\n"
-            "• Tkg-Stable: Enhanced performance build\n"
-            "• Tkg-git: Latest development version with cutting-edge features\n\n"
-            "Choose the one that best fits your needs and hardware."
-        )
-        dialog.add_response("ok", "OK")
-        dialog.set_default_response("ok")
-        dialog.set_close_response("ok")
-        dialog.present()
+        # Build the dialog once and reuse it - compatible with older libadwaita
+        if self._help_dialog is None:
+            dialog = Adw.MessageDialog.new(self.get_root())
+            dialog.set_heading("Video Drivers Information")
+            dialog.set_body(_HELP_BODY)
+            dialog.add_response("ok", "OK")
+            dialog.set_default_response("ok")
+            dialog.set_close_response("ok")
+            dialog.set_hide_on_close(True)
+            self._help_dialog = dialog
+
+        self._help_dialog.present()
 
     def _on_apply_clicked(self, button):
         """Apply the selected driver changes."""
-        # Find which driver is selected
-        selected_driver = None
-        for driver_id, button in self.driver_buttons.items():
-            if button.get_active():
-                selected_driver = driver_id
-                break
-
+        selected_driver = self._selected_driver
         if selected_driver is None:
             return
 
-        # Show a confirmation dialog to prevent accidental changes - compatible with older libadwaita
-        dialog = Adw.MessageDialog.new(self.get_root())
-        dialog.set_heading("Apply Driver Changes")
-        dialog.set_body(
-            f"Are you sure you want to apply the selected driver changes?\n\nThis will modify your system's video drivers and might require a reboot."
-        )
+        # Show a confirmation dialog to prevent accidental changes
+        self._pending_driver = selected_driver
+        self._get_confirm_dialog().present()
+
+    def _get_confirm_dialog(self):
+        """Return the confirmation dialog, creating it on first use."""
+        # Compatible with older libadwaita
+        if self._confirm_dialog is None:
+            dialog = Adw.MessageDialog.new(self.get_root())
+            dialog.set_heading("Apply Driver Changes")
+            dialog.set_body(_CONFIRM_BODY)
 
-        dialog.add_response("cancel", "Cancel")
-        dialog.add_response("apply", "Apply Changes")
-        dialog.set_response_appearance("apply", Adw.ResponseAppearance.SUGGESTED)
-        dialog.set_default_response("cancel")
-        dialog.set_close_response("cancel")
+            dialog.add_response("cancel", "Cancel")
+            dialog.add_response("apply", "Apply Changes")
+            dialog.set_response_appearance("apply", Adw.ResponseAppearance.SUGGESTED)
+            dialog.set_default_response("cancel")
+            dialog.set_close_response("cancel")
+            dialog.set_hide_on_close(True)
 
-        # Connect the response signal
-        dialog.connect("response", self._on_confirm_dialog_response, selected_driver)
+            # Connect the response signal
+            dialog.connect("response", self._on_confirm_dialog_response)
+            self._confirm_dialog = dialog
 
-        # Show the dialog
-        dialog.present()
+        return self._confirm_dialog
 
-    def _on_confirm_dialog_response(self, dialog, response, selected_driver):
+    def _on_confirm_dialog_response(self, dialog, response):
         """Handle the confirmation dialog response."""
-        if response != "apply":
+        selected_driver, self._pending_driver = self._pending_driver, None
+        if response != "apply" or selected_driver is None:
             return
 
         # Show progress bar
@@ -445,28 +450,25 @@ class MesaPage(Gtk.Box):
 
         # Disable button during operation
         self.apply_button.set_sensitive(False)
+        self._applying_driver = selected_driver
 
         # Start installation in a separate thread to avoid UI freezing
         self.mesa_manager.apply_driver(
             selected_driver,
-            progress_callback=self._update_progress,
+            progress_callback=self._progress.push,
             complete_callback=lambda success: GLib.idle_add(
                 self._application_complete, success
             ),
         )
 
-    def _update_progress(self, fraction, text=None):
+    def _draw_progress(self, fraction, text):
         """
-        Update the progress bar.
+        Show a progress update (called on the main loop by the throttler).
 
         Args:
             fraction: Progress fraction (0.0 to 1.0).
             text: Optional text to display.
         """
-        GLib.idle_add(self._update_progress_idle, fraction, text)
-
-    def _update_progress_idle(self, fraction, text):
-        """Update progress bar from main thread."""
         self.progress_bar.set_fraction(fraction)
         if text:
             self.progress_bar.set_text(text)
@@ -475,10 +477,11 @@ class MesaPage(Gtk.Box):
         if not self.progress_container.get_visible():
             self.progress_container.set_visible(True)
 
-        return False  # Don't call again
-
     def _application_complete(self, success):
         """Handle application completion."""
+        # A late progress update must not overwrite the final state
+        self._progress.cancel()
+
         # Re-enable button
         self.apply_button.set_sensitive(True)
 
@@ -490,7 +493,7 @@ class MesaPage(Gtk.Box):
             # Show completion dialog
             self._show_completion_dialog(
                 "Driver Changed Successfully",
-                "The video driver was changed successfully.\nYou may need to reboot your system for changes to take effect.",
+                _SUCCESS_BODY,
                 "success",
             )
         else:
@@ -499,18 +502,36 @@ class MesaPage(Gtk.Box):
             # Show failure dialog
             self._show_completion_dialog(
                 "Failed to Change Driver",
-                "The driver change operation failed. Please check the system logs for details.",
+                _FAILURE_BODY,
                 "error",
             )
 
-        # Refresh driver list
-        self._load_mesa_drivers()
+        # The applied driver is now the active one; only a failed change
+        # leaves the installed packages unknown and needs a fresh query
+        if success:
+            self._set_active_driver(self._applying_driver)
+        else:
+            self._load_mesa_drivers()
+        # The radio group still shows the selection, so keep it for Apply
+        self._applying_driver = None
 
         return False
 
     def _show_completion_dialog(self, title, message, status):
         """Show a completion dialog with OK button."""
-        dialog = Adw.MessageDialog.new(self.get_root())
+        # Build the dialog once and reuse it for later results
+        if self._completion_dialog is None:
+            dialog = Adw.MessageDialog.new(self.get_root())
+            dialog.add_response("ok", "OK")
+            dialog.set_default_response("ok")
+            dialog.set_close_response("ok")
+            dialog.set_hide_on_close(True)
+
+            # Connect close response to hide progress container
+            dialog.connect("response", self._on_completion_dialog_response)
+            self._completion_dialog = dialog
+
+        dialog = self._completion_dialog
         dialog.set_heading(title)
         dialog.set_body(message)
 
@@ -521,63 +542,15 @@ class MesaPage(Gtk.Box):
             else:
                 dialog.set_icon_name("dialog-error-symbolic")
 
-        dialog.add_response("ok", "OK")
-        dialog.set_default_response("ok")
-        dialog.set_close_response("ok")
-
-        # Connect close response to hide progress container
-        dialog.connect("response", lambda d, r: self._hide_progress_container())
-
         dialog.present()
 
-    def _hide_progress_bar(self):
-        """Hide the progress bar."""
-        # Wait a short time to ensure animations are complete
-        GLib.timeout_add(100, self._actually_hide_progress_bar)
-        return False  # Don't call again
-
-    def _actually_hide_progress_bar(self):
-        """Actually hide the progress container after a short delay."""
-        self.progress_container.set_visible(False)
-        return False  # Don't call again
+    def _on_completion_dialog_response(self, dialog, response):
+        """Hide the progress container once the result has been acknowledged."""
+        self._hide_progress_container()
 
-    def _find_toast_overlay(self):
-        """Find the nearest ToastOverlay in the widget hierarchy."""
-        # Try to find a toast overlay in the hierarchy
-        widget = self
-        while widget:
-            if isinstance(widget, Adw.ToastOverlay):
-                return widget
-            parent = widget.get_parent()
-            if parent is None:
-                # Try to get the root widget
-                root = widget.get_root()
-                if root and hasattr(root, "get_content"):
-                    content = root.get_content()
-                    # Check if content is a toast overlay or contains one
-                    if isinstance(content, Adw.ToastOverlay):
-                        return content
-                    # Try to find a toast overlay in the content
-                    if hasattr(content, "get_first_child"):
-                        child = content.get_first_child()
-                        while child:
-                            if isinstance(child, Adw.ToastOverlay):
-                                return child
-                            child = child.get_next_sibling()
-                break
-            widget = parent
-
-        # Fall back to checking if we have a window with a toast overlay
-        window = self.get_root()
-        if window:
-            content = window.get_content()
-            while content:
-                if isinstance(content, Adw.ToastOverlay):
-                    return content
-                if hasattr(content, "get_content"):
-                    content = content.get_content()
-                else:
-                    break
-
-        # No toast overlay found
-        return None
+    def _on_unrealize(self, widget):
+        """Cancel pending timeouts so they never run on a torn-down page."""
+        self._progress.cancel()
+        if self._hide_source is not None:
+            GLib.source_remove(self._hide_source)
+            self._hide_source = None
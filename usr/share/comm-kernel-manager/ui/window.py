@@ -7,8 +7,7 @@ Kernel Manager Application - Main Window
 This module defines the main application window for the Kernel Manager.
 """
 
-import os
-import json
+import atexit
 import gi
 
 gi.require_version("Gtk", "4.0")
@@ -16,7 +15,19 @@ gi.require_version("Adw", "1")
 from gi.repository import Gtk, Adw, GLib
 
 from ui.kernel_page import KernelPage
-from ui.mesa_page import MesaPage
+
+# Body of the startup warning dialog (Pango markup)
+_WARNING_BODY = (
+    "Changing kernels or drivers can impact system stability.\n\n"
+    "<b>Kernel Management</b>\n"
+    "• Always keep at least one working kernel installed\n"
+    "• LTS kernels offer better stability\n"
+    "• Real-time kernels are specialized for specific tasks\n\n"
+    "<b>Mesa Driver Management</b>\n"
+    "• Stable versions are recommended for most users\n"
+    "• Development versions may have issues with some applications\n\n"
+    "Consider backing up your system before making changes."
+)
 
 
 class KernelManagerWindow(Adw.ApplicationWindow):
@@ -29,50 +40,85 @@ class KernelManagerWindow(Adw.ApplicationWindow):
         # Set up window properties
         self.set_default_size(800, 630)
 
+        # Looked up once; pages and settings are shared through it
+        app = self.get_application()
+
         # Create the toast overlay for notifications
         self.toast_overlay = Adw.ToastOverlay()
 
         # Create the toolbar view first (fix parent widget issue)
         self.toolbar = Adw.ToolbarView()
 
-        # Set the toolbar as the child of the toast overlay
-        self.toast_overlay.set_child(self.toolbar)
-
         # Create a simple content stack using Adw.ViewStack
         self.content = Adw.ViewStack()
 
-        # Set the content stack as the content of the toolbar view
-        self.toolbar.set_content(self.content)
-
         # Create the header bar with view switcher
         self._setup_header()
 
         # Create tabs (pages) for the different functionalities
-        self._setup_pages()
+        self._setup_pages(app)
 
-        # Set the window content
+        # Assemble the hierarchy bottom-up once everything is built
+        self.toolbar.set_content(self.content)
+        self.toast_overlay.set_child(self.toolbar)
         self.set_content(self.toast_overlay)
 
         # Initialize settings and check for warning dialog
-        self._init_settings()
-        GLib.idle_add(self._check_show_warning)
+        self._init_settings(app)
+        # Checked a second after startup, once the main window has painted;
+        # a seconds timer lets GLib merge the wakeup with other timers
+        GLib.timeout_add_seconds(1, self._check_show_warning)
+
+        # Write a pending settings change before the window goes away
+        self.connect("close-request", self._on_close_request)
+
+    def _setup_pages(self, app):
+        """
+        Set up the main content pages.
+
+        Args:
+            app: The application owning this window, or None.
+        """
+        # Share the application's package manager between pages
+        package_manager = getattr(app, "package_manager", None)
 
-    def _setup_pages(self):
-        """Set up the main content pages."""
         # Create and add the kernel management page
-        kernel_page = KernelPage()
+        kernel_page = KernelPage(package_manager=package_manager)
         self.content.add_titled_with_icon(
             kernel_page, "kernel", "Kernel", "system-run-symbolic"
         )
 
-        # Create and add the Mesa drivers page
-        mesa_page = MesaPage()
+        # The Mesa drivers page is built the first time its tab is shown
+        self._mesa_placeholder = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
         self.content.add_titled_with_icon(
-            mesa_page, "mesa", "Mesa Drivers", "preferences-system-details-symbolic"
+            self._mesa_placeholder,
+            "mesa",
+            "Mesa Drivers",
+            "preferences-system-details-symbolic",
+        )
+        self._package_manager = package_manager
+        self._tab_handler = self.content.connect(
+            "notify::visible-child-name", self._on_tab_changed
         )
 
         # Store reference to pages
         self.kernel_page = kernel_page
+        self.mesa_page = None
+
+    def _on_tab_changed(self, stack, pspec):
+        """Build the Mesa drivers page on the first switch to its tab."""
+        if stack.get_visible_child_name() != "mesa":
+            return
+
+        # Only needed once
+        stack.disconnect(self._tab_handler)
+        self._tab_handler = None
+
+        # Imported here so startup does not pay for the Mesa modules
+        from ui.mesa_page import MesaPage
+
+        mesa_page = MesaPage(package_manager=self._package_manager)
+        self._mesa_placeholder.append(mesa_page)
         self.mesa_page = mesa_page
 
     def _setup_header(self):
@@ -91,48 +137,31 @@ class KernelManagerWindow(Adw.ApplicationWindow):
         # Add header to the toolbar view
         self.toolbar.add_top_bar(header)
 
-    def _init_settings(self):
-        """Initialize settings for the application."""
-        app = self.get_application()
-        if hasattr(app, "settings_manager"):
-            # Use the application's settings manager
-            self.settings = app.settings_manager
-        else:
-            # Create a local settings manager as fallback
-            self.settings = SettingsAdapter()
+    def _init_settings(self, app):
+        """
+        Initialize settings for the application.
+
+        Args:
+            app: The application owning this window, or None.
+        """
+        # Use the application's settings manager, or a local one as fallback
+        self.settings = getattr(app, "settings_manager", None) or SettingsAdapter()
 
     def _check_show_warning(self):
         """Check whether to show the warning dialog."""
-        try:
-            # Use load_setting instead of get to match SettingsManager API
-            show_warning = self.settings.load_setting(
-                "show-kernel-warning-on-startup", True
-            )
-            if show_warning:
-                self._show_warning_dialog()
-        except Exception as e:
-            print(f"Error checking warning dialog setting: {e}")
-        return False  # Don't call again
+        # Use load_setting instead of get to match SettingsManager API;
+        # it is a plain dict lookup on data loaded at startup
+        show_warning = self.settings.load_setting(
+            "show-kernel-warning-on-startup", True
+        )
+        if not show_warning:
+            return False  # Don't call again
 
-    def _show_warning_dialog(self):
-        """Show warning dialog about kernel and mesa modifications."""
+        # Warning dialog about kernel and mesa modifications, shown once
         dialog = Adw.AlertDialog()
         dialog.set_heading("Warning: System Modifications")
 
-        # Create the main message
-        message = (
-            "Changing kernels or drivers can impact system stability.\n\n"
-            "<b>Kernel Management</b>\n"
-            "• Always keep at least one working kernel installed\n"
-            "• LTS kernels offer better stability\n"
-            "• Real-time kernels are specialized for specific tasks\n\n"
-            "<b>Mesa Driver Management</b>\n"
-            "• Stable versions are recommended for most users\n"
-            "• Development versions may have issues with some applications\n\n"
-            "Consider backing up your system before making changes."
-        )
-
-        dialog.set_body(message)
+        dialog.set_body(_WARNING_BODY)
         dialog.set_body_use_markup(True)
 
         # Add responses
@@ -148,6 +177,7 @@ class KernelManagerWindow(Adw.ApplicationWindow):
         dialog.set_extra_child(check)
 
         dialog.present(self)
+        return False  # Don't call again
 
     def _on_dont_show_toggled(self, check):
         """Handle checkbox toggle for the warning dialog."""
@@ -155,6 +185,11 @@ class KernelManagerWindow(Adw.ApplicationWindow):
         show_warning = not check.get_active()
         self.settings.save_setting("show-kernel-warning-on-startup", show_warning)
 
+    def _on_close_request(self, window):
+        """Flush debounced settings writes when the window is closed."""
+        self.settings.flush()
+        return False  # Let the window close
+
     def add_toast(self, message, timeout=3):
         """Show a toast notification."""
         toast = Adw.Toast.new(message)
@@ -163,39 +198,28 @@ class KernelManagerWindow(Adw.ApplicationWindow):
 
 
 class SettingsAdapter:
-    """Adapter for the Settings class to match SettingsManager API."""
+    """Fallback settings store when the window has no application."""
+
+    __slots__ = ("_manager",)
 
     def __init__(self):
         """Initialize settings adapter."""
-        self.path = os.path.expanduser("~/.config/kernel-manager/settings.json")
-        os.makedirs(os.path.dirname(self.path), exist_ok=True)
-        self.data = self._load()
-
-    def _load(self):
-        """Load settings from file."""
-        try:
-            if os.path.exists(self.path):
-                with open(self.path, "r") as f:
-                    return json.load(f)
-        except Exception as e:
-            print(f"Error loading settings: {e}")
-        return {}
-
-    def _save(self):
-        """Save settings to file."""
-        try:
-            with open(self.path, "w") as f:
-                json.dump(self.data, f, indent=2)
-            return True
-        except Exception as e:
-            print(f"Error saving settings: {e}")
-            return False
+        # Imported here: ui.application imports this module
+        from ui.application import SettingsManager
+
+        self._manager = SettingsManager()
+
+        # There is no application shutdown hook for the fallback adapter
+        atexit.register(self._manager.flush)
+
+    def flush(self):
+        """Write pending changes to disk immediately."""
+        return self._manager.flush()
 
     def load_setting(self, key, default=None):
-        """Load a setting value - matches SettingsManager API."""
-        return self.data.get(key, default)
+        """Load a setting value."""
+        return self._manager.load_setting(key, default)
 
     def save_setting(self, key, value):
-        """Save a setting value - matches SettingsManager API."""
-        self.data[key] = value
-        return self._save()
+        """Save a setting value (written to disk shortly after)."""
+        return self._manager.save_setting(key, value)